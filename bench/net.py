@@ -0,0 +1,205 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmarks `HTTPNet.request` against a local aiohttp mock server.
+
+Nothing here touches the network, The server is bound to the loopback interface.
+"""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Latency", "MockOptions", "Result", "run")
+
+import asyncio
+import gc
+import itertools
+import logging
+import socket
+import statistics
+import time
+import tracemalloc
+import typing
+
+import attrs
+from aiohttp import web
+
+from core.std import net
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+
+@attrs.frozen(kw_only=True)
+class MockOptions:
+    """How the mock server behaves."""
+
+    latency: float = 0.0
+    """Seconds to sleep before responding."""
+    size: int = 512
+    """Size in bytes of the JSON payload."""
+    status: int = 200
+    ratelimit_every: int = 0
+    """Respond with a 429 every n requests, `0` disables it."""
+
+
+@attrs.frozen(kw_only=True)
+class Latency:
+    """Exact latency percentiles in milliseconds computed from every sample."""
+
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: collections.Sequence[float]) -> Latency:
+        if not samples:
+            return cls(p50=0.0, p95=0.0, p99=0.0, max=0.0)
+
+        if len(samples) == 1:
+            return cls(p50=samples[0], p95=samples[0], p99=samples[0], max=samples[0])
+
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        return cls(p50=cuts[49], p95=cuts[94], p99=cuts[98], max=max(samples))
+
+
+@attrs.frozen(kw_only=True)
+class Result:
+    concurrency: int
+    requests: int
+    failures: int
+    elapsed: float
+    latency: Latency
+    memory_peak: int | None
+
+    @property
+    def rps(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        memory = (
+            f"{self.memory_peak / 1024:.0f}KiB" if self.memory_peak is not None else "-"
+        )
+        return (
+            f"concurrency={self.concurrency:<4} rps={self.rps:<9.1f} "
+            f"p50={self.latency.p50:.1f}ms p95={self.latency.p95:.1f}ms "
+            f"p99={self.latency.p99:.1f}ms max={self.latency.max:.1f}ms "
+            f"failures={self.failures} memory={memory}"
+        )
+
+
+def _make_app(options: MockOptions) -> web.Application:
+    body = {"fact": "x" * max(options.size - 24, 0), "image": "bench"}
+    counter = itertools.count(1)
+
+    async def handler(_: web.Request) -> web.Response:
+        if options.latency:
+            await asyncio.sleep(options.latency)
+
+        if options.ratelimit_every and next(counter) % options.ratelimit_every == 0:
+            return web.json_response(
+                {"message": "ratelimited"}, status=429, headers={"Retry-After": "0"}
+            )
+
+        return web.json_response(body, status=options.status)
+
+    app = web.Application()
+    app.router.add_get("/bench", handler)
+    return app
+
+
+async def _drive(
+    client: net.HTTPNet, url: str, concurrency: int, requests: int, unique: bool
+) -> tuple[Latency, int]:
+    samples: list[float] = []
+    failures = 0
+    counter = itertools.count()
+
+    async def worker() -> None:
+        nonlocal failures
+        while (n := next(counter)) < requests:
+            # A unique query string so the in-flight deduplication doesn't kick in.
+            target = f"{url}?n={n}" if unique else url
+            started = time.perf_counter()
+            try:
+                await client.request("GET", target)
+            except Exception:
+                failures += 1
+            samples.append((time.perf_counter() - started) * 1_000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return Latency.from_samples(samples), failures
+
+
+async def run(
+    options: MockOptions,
+    *,
+    concurrency: collections.Sequence[int] = (1, 8, 32, 128),
+    requests: int = 500,
+    unique: bool = True,
+    trace_memory: bool = False,
+    port: int = 0,
+) -> list[Result]:
+    """Start the mock server and drive `HTTPNet` at each concurrency level."""
+    # Logging every request would be benchmarked along with it.
+    logging.getLogger("core.net").setLevel(logging.ERROR)
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", port))
+    url = f"http://127.0.0.1:{sock.getsockname()[1]}/bench"
+
+    runner = web.AppRunner(_make_app(options), access_log=None)
+    await runner.setup()
+    await web.SockSite(runner, sock).start()
+
+    results: list[Result] = []
+    try:
+        for level in concurrency:
+            gc.collect()
+            if trace_memory:
+                tracemalloc.start()
+
+            async with net.HTTPNet() as client:
+                started = time.perf_counter()
+                latency, failures = await _drive(client, url, level, requests, unique)
+                elapsed = time.perf_counter() - started
+
+            peak: int | None = None
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            results.append(
+                Result(
+                    concurrency=level,
+                    requests=requests,
+                    failures=failures,
+                    elapsed=elapsed,
+                    latency=latency,
+                    memory_peak=peak,
+                )
+            )
+    finally:
+        await runner.cleanup()
+
+    return results
@@ -24,21 +24,23 @@
 from __future__ import annotations
 
 import logging
+import pathlib
 import subprocess
 import traceback
 import typing
 
 import aiobungie
+import attrs
 import click
 import hikari
 import tanjun
 import yuyo
 from hikari.internal import aio
 
-from core.psql import pool
+from core.psql import lite, pool
 from core.std import cache
 from core.std import config as __config
-from core.std import net, traits
+from core.std import manifest, net, prefetch, traits
 
 if typing.TYPE_CHECKING:
     from hikari import traits as hikari_traits
@@ -53,9 +55,16 @@ def _setup_client(
     /,
 ) -> None:
     # Database pool.
-    pg_pool = pool.PgxPool(config)
+    pg_pool: pool.PgxPool | lite.SqlitePool = (
+        lite.SqlitePool(config)
+        if config.DB_BACKEND == "sqlite"
+        else pool.PgxPool(config)
+    )
     # Networking.
-    client_session = net.HTTPNet()
+    client_session = net.HTTPNet(
+        dns_ttl=config.DNS_CACHE_TTL, warm_hosts=config.WARM_HOSTS
+    )
+    prefetcher = prefetch.Prefetcher(client_session)
     # Cache
     redis_hash = cache.Hash(config)
     mem_cache = cache.Memory[typing.Any, typing.Any]()
@@ -66,10 +75,15 @@ def _setup_client(
         client
         # pg pool
         .set_type_dependency(traits.PoolRunner, pg_pool)
-        .add_client_callback(tanjun.ClientCallbackNames.STARTING, pg_pool.partial.open)
-        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, pg_pool.partial.close)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTING, pg_pool.open)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, pg_pool.close)
         # HTTP.
         .set_type_dependency(traits.NetRunner, client_session)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTING, client_session.open)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, client_session.close)
+        .set_type_dependency(prefetch.Prefetcher, prefetcher)
+        .add_client_callback(tanjun.ClientCallbackNames.STARTING, prefetcher.open)
+        .add_client_callback(tanjun.ClientCallbackNames.CLOSING, prefetcher.close)
         # Cache. This is kinda overkill but we need the memory cache for api requests
         # And the redis hash for stuff that are not worth storing in a database for the sake of speed.
         # i.e., OAuth2 tokens
@@ -95,11 +109,30 @@ def _setup_client(
             max_retries=1,
         )
         redis_hash.client(aiobungie_client)
+        manifest_ = manifest.Manifest(
+            aiobungie_client,
+            path=config.MANIFEST_PATH,
+            language=config.MANIFEST_LANGUAGE,
+            interval=config.MANIFEST_UPDATE_INTERVAL,
+        )
+
+        async def open_bungie_rest() -> None:
+            aiobungie_client.rest.open()
+            # Resolves Bungie's host and leaves a keep-alive connection in the pool
+            # so the first command doesn't pay for the handshakes.
+            try:
+                await aiobungie_client.rest.fetch_common_settings()
+            except Exception as exc:
+                _LOGGER.warning("Couldn't warm up the Bungie connection: %s", exc)
+
         client.set_type_dependency(aiobungie.Client, aiobungie_client)
         client.add_client_callback(
             tanjun.ClientCallbackNames.CLOSING, aiobungie_client.rest.close
-        ).add_client_callback(
-            tanjun.ClientCallbackNames.STARTING, aiobungie_client.rest.open
+        ).add_client_callback(tanjun.ClientCallbackNames.STARTING, open_bungie_rest)
+        (
+            client.set_type_dependency(manifest.Manifest, manifest_)
+            .add_client_callback(tanjun.ClientCallbackNames.STARTING, manifest_.open)
+            .add_client_callback(tanjun.ClientCallbackNames.CLOSING, manifest_.close)
         )
         (
             tanjun.InMemoryCooldownManager()
@@ -144,7 +177,9 @@ def _enable_logging() -> None:
     for logger in (
         logging.getLogger("core.net"),
         logging.getLogger("fated.cache"),
+        logging.getLogger("fated.prefetch"),
         logging.getLogger("fated.pool"),
+        logging.getLogger("fated.manifest"),
         logging.getLogger("fated.client"),
     ):
         logger.setLevel(logging.DEBUG)
@@ -188,6 +223,124 @@ def init() -> None:
         loop.run_until_complete(pool_.close())
 
 
+@db.command(name="migrate", short_help="Apply the pending schema migrations.")
+def migrate() -> None:
+    loop = aio.get_or_make_loop()
+    pool_ = pool.PartialPool(__config.Config.into_dotenv())
+    # Migrations are applied on top of the base tables.
+    loop.run_until_complete(pool_.open(build=True))
+    try:
+        applied = loop.run_until_complete(pool_.migrate())
+    finally:
+        loop.run_until_complete(pool_.close())
+
+    if not applied:
+        click.echo("Database is up to date.")
+    for migration in applied:
+        click.echo(f"Applied {migration}.")
+
+
+_COPY_FORMAT = click.Choice(["binary", "csv"])
+
+
+def _copy_pool() -> pool.PgxPool:
+    # Without the cache the pool doesn't open a connection to listen for changes.
+    return pool.PgxPool(
+        attrs.evolve(__config.Config.into_dotenv(), MEMBERSHIP_CACHE_SIZE=0)
+    )
+
+
+@db.command(name="export", short_help="Export the Destiny memberships into a file.")
+@click.argument("path", type=click.Path(dir_okay=False, path_type=pathlib.Path))
+@click.option("--format", "format_", type=_COPY_FORMAT, default="binary")
+def export(path: pathlib.Path, format_: typing.Literal["binary", "csv"]) -> None:
+    loop = aio.get_or_make_loop()
+    pool_ = _copy_pool()
+    loop.run_until_complete(pool_.partial.open())
+    try:
+        count = loop.run_until_complete(
+            pool_.export_destiny_members(path, format=format_)
+        )
+        click.echo(f"Exported {count} memberships into {path}.")
+    finally:
+        loop.run_until_complete(pool_.partial.close())
+
+
+@db.command(name="import", short_help="Import Destiny memberships from a file.")
+@click.argument(
+    "path", type=click.Path(exists=True, dir_okay=False, path_type=pathlib.Path)
+)
+@click.option("--format", "format_", type=_COPY_FORMAT, default="binary")
+@click.option("--truncate", is_flag=True, help="Remove the current memberships first.")
+def import_(
+    path: pathlib.Path, format_: typing.Literal["binary", "csv"], truncate: bool
+) -> None:
+    loop = aio.get_or_make_loop()
+    pool_ = _copy_pool()
+    loop.run_until_complete(pool_.partial.open())
+    try:
+        count = loop.run_until_complete(
+            pool_.import_destiny_members(path, format=format_, truncate=truncate)
+        )
+        click.echo(f"Imported {count} memberships from {path}.")
+    finally:
+        loop.run_until_complete(pool_.partial.close())
+
+
+@main.group(short_help="Offline benchmarks.", options_metavar="[options]")
+def bench() -> None:
+    pass
+
+
+@bench.command(name="net", short_help="Benchmark HTTPNet against a local mock server.")
+@click.option(
+    "--concurrency",
+    "-c",
+    multiple=True,
+    type=int,
+    default=(1, 8, 32, 128),
+    show_default=True,
+)
+@click.option("--requests", "-n", type=int, default=500, show_default=True)
+@click.option("--latency", type=float, default=0.0, help="Server latency in seconds.")
+@click.option("--size", type=int, default=512, help="Payload size in bytes.")
+@click.option("--status", type=int, default=200, help="Status code to respond with.")
+@click.option("--ratelimit-every", type=int, default=0, help="429 every n requests.")
+@click.option("--shared", is_flag=True, help="Request the same URL every time.")
+@click.option("--memory", is_flag=True, help="Trace the peak memory usage.")
+@click.option("--max-p99", type=float, default=None, help="Fail above this p99 (ms).")
+def bench_net(
+    concurrency: tuple[int, ...],
+    requests: int,
+    latency: float,
+    size: int,
+    status: int,
+    ratelimit_every: int,
+    shared: bool,
+    memory: bool,
+    max_p99: float | None,
+) -> None:
+    from bench import net as net_bench
+
+    options = net_bench.MockOptions(
+        latency=latency, size=size, status=status, ratelimit_every=ratelimit_every
+    )
+    results = aio.get_or_make_loop().run_until_complete(
+        net_bench.run(
+            options,
+            concurrency=concurrency,
+            requests=requests,
+            unique=not shared,
+            trace_memory=memory,
+        )
+    )
+    for result in results:
+        click.echo(result)
+
+    if max_p99 is not None and any(r.latency.p99 > max_p99 for r in results):
+        raise click.ClickException(f"p99 latency is over {max_p99}ms.")
+
+
 @main.command(name="format", short_help="Format the bot code.")
 def format_code() -> None:
     commands = ("ruff format", "isort core", "codespell core -w -L crates")
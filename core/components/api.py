@@ -34,39 +34,37 @@ import hikari
 import tanjun
 import yuyo
 
-from core.std import boxed, traits
+from core import models
+from core.std import boxed, prefetch, traits
 
 
 # Fun stuff.
 @tanjun.as_message_command("dog")
 async def doggo(
     ctx: tanjun.abc.MessageContext,
-    net: alluka.Injected[traits.NetRunner],
+    prefetcher: alluka.Injected[prefetch.Prefetcher],
 ) -> None:
-    async with net as client:
-        resp = await client.request(
-            "GET",
-            "https://some-random-api.ml/animal/dog",
-        )
-        assert isinstance(resp, dict)
-        embed = hikari.Embed(description=resp["fact"])
-        embed.set_image(resp["image"])
+    resp = await prefetcher.get(
+        "https://some-random-api.ml/animal/dog", schema=models.Animal
+    )
+    embed = hikari.Embed(description=resp.fact)
+    embed.set_image(resp.image)
 
-        await ctx.respond(embed=embed)
+    await ctx.respond(embed=embed)
 
 
 @tanjun.as_message_command("cat")
 async def cat(
     ctx: tanjun.abc.MessageContext,
-    net: alluka.Injected[traits.NetRunner],
+    prefetcher: alluka.Injected[prefetch.Prefetcher],
 ) -> None:
-    async with net as client:
-        resp = await client.request("GET", "https://some-random-api.ml/animal/cat")
-        assert isinstance(resp, dict)
-        embed = hikari.Embed(description=resp["fact"])
-        embed.set_image(resp["image"])
+    resp = await prefetcher.get(
+        "https://some-random-api.ml/animal/cat", schema=models.Animal
+    )
+    embed = hikari.Embed(description=resp.fact)
+    embed.set_image(resp.image)
 
-        await ctx.respond(embed=embed)
+    await ctx.respond(embed=embed)
 
 
 @tanjun.with_argument("member", converters=tanjun.to_member, default=None)
@@ -75,19 +73,16 @@ async def cat(
 async def wink(
     ctx: tanjun.abc.MessageContext,
     member: hikari.Member | None,
-    net: alluka.Injected[traits.NetRunner],
+    prefetcher: alluka.Injected[prefetch.Prefetcher],
 ) -> None:
-    async with net as client:
-        resp = await client.request(
-            "GET", "https://some-random-api.ml/animu/wink", getter="link"
-        )
-        assert isinstance(resp, str)
-        embed = hikari.Embed(
-            description=f"{ctx.author.username} winked at {member.username if member else 'their self'} UwU!"
-        )
-        embed.set_image(resp)
+    resp = await prefetcher.get("https://some-random-api.ml/animu/wink", getter="link")
+    assert isinstance(resp, str)
+    embed = hikari.Embed(
+        description=f"{ctx.author.username} winked at {member.username if member else 'their self'} UwU!"
+    )
+    embed.set_image(resp)
 
-        await ctx.respond(embed=embed)
+    await ctx.respond(embed=embed)
 
 
 @tanjun.with_argument("member", converters=tanjun.to_member, default=None)
@@ -96,19 +91,16 @@ async def wink(
 async def pat(
     ctx: tanjun.abc.MessageContext,
     member: hikari.Member | None,
-    net: alluka.Injected[traits.NetRunner],
+    prefetcher: alluka.Injected[prefetch.Prefetcher],
 ) -> None:
-    async with net as client:
-        resp = await client.request(
-            "GET", "https://some-random-api.ml/animu/pat", getter="link"
-        )
-        assert isinstance(resp, str)
-        embed = hikari.Embed(
-            description=f"{ctx.author.username} pats {member.username if member else 'their self'} UwU!"
-        )
-        embed.set_image(resp)
+    resp = await prefetcher.get("https://some-random-api.ml/animu/pat", getter="link")
+    assert isinstance(resp, str)
+    embed = hikari.Embed(
+        description=f"{ctx.author.username} pats {member.username if member else 'their self'} UwU!"
+    )
+    embed.set_image(resp)
 
-        await ctx.respond(embed=embed)
+    await ctx.respond(embed=embed)
 
 
 @tanjun.with_argument("member", converters=tanjun.to_member, default=None)
@@ -161,4 +153,28 @@ async def run_net(
         await ctx.respond(formatted)
 
 
+@tanjun.with_owner_check(halt_execution=True)
+@tanjun.as_message_command("circuits")
+async def circuits_view(
+    ctx: tanjun.abc.MessageContext,
+    net: alluka.Injected[traits.NetRunner],
+) -> None:
+    """View the state of the upstream hosts circuit breakers."""
+
+    if not (circuits := net.circuits()):
+        await ctx.respond("No hosts were requested yet.", delete_after=5)
+        return
+
+    await ctx.respond(
+        boxed.with_block(
+            "\n".join(
+                f"{host}::{circuit.state} "
+                f"errors={circuit.error_rate:.0%} trips={circuit.trips}"
+                for host, circuit in circuits.items()
+            ),
+            lang="css",
+        )
+    )
+
+
 api = tanjun.Component(name="APIs", strict=True).load_from_scope().make_loader()
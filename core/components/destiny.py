@@ -38,11 +38,13 @@ import tanjun
 import yuyo
 
 from core.psql import pool
-from core.std import boxed, cache, traits
+from core.std import boxed, cache, manifest, traits
 
 if typing.TYPE_CHECKING:
     import collections.abc as collections
 
+    from aiobungie import typedefs
+
 
 # boxed usually used as slash options key -> val.
 _PLATFORMS: dict[str, aiobungie.MembershipType] = {
@@ -180,7 +182,9 @@ async def _pool_or_rest(
     return id, platform, name
 
 
-async def _fetch_instance(client: aiobungie.Client, instance_id: int) -> hikari.Embed:
+async def _fetch_instance(
+    client: aiobungie.Client, manifest_: manifest.Manifest, instance_id: int
+) -> hikari.Embed:
     try:
         post = await client.fetch_post_activity(instance_id)
     except aiobungie.HTTPError as e:
@@ -207,7 +211,7 @@ async def _fetch_instance(client: aiobungie.Client, instance_id: int) -> hikari.
     )
 
     try:
-        activity = await client.rest.fetch_entity(
+        activity = await manifest_.fetch_entity(
             "DestinyActivityDefinition", post.reference_id
         )
     except aiobungie.HTTPError:
@@ -647,6 +651,7 @@ async def acquired_items_command(
     client: alluka.Injected[aiobungie.Client],
     pool_: alluka.Injected[traits.PoolRunner],
     component_client: alluka.Injected[yuyo.ComponentClient],
+    manifest_: alluka.Injected[manifest.Manifest],
 ) -> None:
     member = member or ctx.author
     # This is kinda repeatable :\.
@@ -675,7 +680,7 @@ async def acquired_items_command(
 
         items = await boxed.spawn(
             *(
-                client.rest.fetch_entity("DestinyCollectibleDefinition", item)
+                manifest_.fetch_entity("DestinyCollectibleDefinition", item)
                 for item in recent_items
             )
         )
@@ -735,8 +740,42 @@ async def search_players(
     await boxed.generate_component(ctx, iters, component_client)
 
 
+_DEFAULT_DEFINITION: typing.Final[str] = "DestinyInventoryItemDefinition"
+
+
+async def _entity_autocomplete(
+    ctx: tanjun.abc.AutocompleteContext,
+    value: str,
+    manifest_: alluka.Injected[manifest.Manifest],
+) -> None:
+    definition = ctx.options.get("definition")
+    matches = manifest_.search(
+        str(definition.value) if definition else _DEFAULT_DEFINITION, value
+    )
+    await ctx.set_choices({match.name[:100]: match.name[:100] for match in matches})
+
+
+def _build_local_entity_embed(
+    definition: str, hash: int, entity: typedefs.JSONObject
+) -> hikari.Embed:
+    properties = entity["displayProperties"]
+    embed = hikari.Embed(
+        title=properties["name"], description=properties.get("description") or None
+    ).add_field("Information", f"Hash: {hash}\n" f"Type: {definition}\n")
+
+    if properties.get("hasIcon"):
+        embed.set_thumbnail(aiobungie.url.BASE + properties["icon"])
+
+    if type_name := entity.get("itemTypeDisplayName"):
+        embed.set_footer(text=type_name)
+
+    return embed
+
+
 @search_group.with_command
-@tanjun.with_str_slash_option("name", "The entity name to search for.")
+@tanjun.with_str_slash_option(
+    "name", "The entity name to search for.", autocomplete=_entity_autocomplete
+)
 @tanjun.with_str_slash_option(
     "definition",
     "The definition of the entity. Default to inventory item",
@@ -748,12 +787,25 @@ async def search_entities(
     name: str,
     definition: str | None,
     client: alluka.Injected[aiobungie.Client],
+    manifest_: alluka.Injected[manifest.Manifest],
     component_client: alluka.Injected[yuyo.ComponentClient],
 ) -> None:
-    try:
-        results = await client.search_entities(
-            name, definition or "DestinyInventoryItemDefinition"
+    definition = definition or _DEFAULT_DEFINITION
+    # Answered from the local definitions when they're stored.
+    if matches := manifest_.search(definition, name):
+        pages = (
+            (
+                hikari.UNDEFINED,
+                _build_local_entity_embed(definition, match.hash, entity),
+            )
+            for match in matches
+            if (entity := manifest_.get(definition, match.hash)) is not None
         )
+        await boxed.generate_component(ctx, pages, component_client)
+        return
+
+    try:
+        results = await client.search_entities(name, definition)
     except aiobungie.NotFound as exc:
         raise tanjun.CommandError(exc.message)
 
@@ -828,21 +880,43 @@ async def get_clan(
     await ctx.respond(embed=embed)
 
 
+async def _item_autocomplete(
+    ctx: tanjun.abc.AutocompleteContext,
+    value: str,
+    manifest_: alluka.Injected[manifest.Manifest],
+) -> None:
+    matches = manifest_.search(_DEFAULT_DEFINITION, value)
+    await ctx.set_choices({match.name[:100]: str(match.hash) for match in matches})
+
+
 @search_group.with_command
-@tanjun.with_int_slash_option("item_hash", "The item hash to get.")
+@tanjun.with_str_slash_option(
+    "item", "The item name or hash to get.", autocomplete=_item_autocomplete
+)
 @tanjun.as_slash_command("get-item", "Fetch a Bungie inventory item by its hash.")
 async def item_definition_command(
     ctx: tanjun.abc.SlashContext,
-    item_hash: int,
+    item: str,
     client: alluka.Injected[aiobungie.Client],
+    manifest_: alluka.Injected[manifest.Manifest],
     cache_: alluka.Injected[cache.Memory[int, hikari.Embed]],
 ) -> None:
+    # Integer options can't be autocompleted by name, So the choices are the hashes.
+    if item.isdigit():
+        item_hash = int(item)
+    elif matches := manifest_.search(_DEFAULT_DEFINITION, item, limit=1):
+        item_hash = matches[0].hash
+    else:
+        raise tanjun.CommandError(f"No items found matching {item}.")
+
     if cached_item := cache_.get(item_hash):
         await ctx.respond(embed=cached_item)
         return
 
     try:
-        entity = await client.fetch_inventory_item(item_hash)
+        entity = client.factory.deserialize_inventory_entity(
+            await manifest_.fetch_entity(_DEFAULT_DEFINITION, item_hash)
+        )
     except aiobungie.HTTPError as exc:
         raise tanjun.CommandError(exc.message)
 
@@ -861,13 +935,14 @@ async def post_activity_command(
     ctx: tanjun.abc.SlashContext,
     instance: int,
     client: alluka.Injected[aiobungie.Client],
+    manifest_: alluka.Injected[manifest.Manifest],
     cache: alluka.Injected[cache.Memory[int, hikari.Embed]],
 ) -> None:
     if cached_instance := cache.get(instance):
         await ctx.respond(embed=cached_instance)
         return
 
-    embed = await _fetch_instance(client, instance)
+    embed = await _fetch_instance(client, manifest_, instance)
 
     cache.put(instance, embed)
     await ctx.respond(embed=embed)
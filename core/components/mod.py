@@ -25,6 +25,8 @@ from __future__ import annotations
 
 __all__ = ("mod",)
 
+import asyncio
+import contextlib
 import datetime
 import sys
 import typing
@@ -32,36 +34,178 @@ import typing
 import alluka
 import hikari
 import tanjun
+import yuyo
 
 from core.std import boxed, cache, traits
 
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
 STDOUT: typing.Final[hikari.Snowflake] = hikari.Snowflake(789614938247266305)
+# Statements that can be streamed through a read-only cursor, `WITH` may write.
+_CURSOR_STATEMENTS: typing.Final[tuple[str, ...]] = (
+    "select",
+    "values",
+    "table",
+)
+_SQL_TIMEOUT: typing.Final[float] = 10.0
+_PAGE_ROWS: typing.Final[int] = 15
+_COLUMN_WIDTH: typing.Final[int] = 24
+
+
+def _cell(value: typing.Any) -> str:
+    text = "NULL" if value is None else str(value).replace("\n", " ")
+    return text if len(text) <= _COLUMN_WIDTH else text[: _COLUMN_WIDTH - 1] + "…"
+
+
+def _table_pages(
+    columns: collections.Sequence[str],
+    rows: collections.Sequence[collections.Sequence[typing.Any]],
+    footer: str,
+) -> collections.Iterator[tuple[hikari.UndefinedType, hikari.Embed]]:
+    cells = [[_cell(value) for value in row] for row in rows]
+    widths = [
+        max([len(column), *(len(row[i]) for row in cells)])
+        for i, column in enumerate(columns)
+    ]
+    header = " | ".join(column.ljust(width) for column, width in zip(columns, widths))
+    separator = "-+-".join("-" * width for width in widths)
+    total = -(-len(cells) // _PAGE_ROWS)
+
+    for page, start in enumerate(range(0, len(cells), _PAGE_ROWS), start=1):
+        lines = [header, separator]
+        lines.extend(
+            " | ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in cells[start : start + _PAGE_ROWS]
+        )
+        yield hikari.UNDEFINED, hikari.Embed(
+            description=boxed.with_block("\n".join(lines), lang="")[:4096],
+            colour=boxed.COLOR["invis"],
+        ).set_footer(f"Page {page}/{total} • {footer}")
+
+
+async def _collect_rows(
+    pool: traits.PartialPool, query: str, limit: int
+) -> list[collections.Mapping[str, typing.Any]]:
+    # One more row than the limit tells us that it was capped.
+    if not query.lower().startswith(_CURSOR_STATEMENTS):
+        # Statements that may write can't be wrapped in a `LIMIT` nor ran in a
+        # read-only cursor, So all of their rows are fetched.
+        return (await pool.fetch(query, timeout=_SQL_TIMEOUT))[: limit + 1]
+
+    rows: list[collections.Mapping[str, typing.Any]] = []
+    cursor = pool.cursor(query, prefetch=min(limit + 1, 100), timeout=_SQL_TIMEOUT)
+    # Closing the cursor early releases its connection right away.
+    async with contextlib.aclosing(cursor):
+        async for row in cursor:
+            rows.append(row)
+            if len(rows) > limit:
+                break
+
+    return rows
 
 
 @tanjun.with_owner_check(halt_execution=True)
+@tanjun.with_option("explain", "--explain", "-e", default=False, empty_value=True)
+@tanjun.with_option("limit", "--limit", "-l", converters=int, default=500)
 @tanjun.with_greedy_argument("query", converters=str)
 @tanjun.with_parser
 @tanjun.as_message_command("sql")
 async def run_sql(
     ctx: tanjun.abc.MessageContext,
     query: str,
+    explain: bool,
+    limit: int,
     pool: alluka.Injected[traits.PoolRunner],
+    component_client: alluka.Injected[yuyo.ComponentClient],
 ) -> None:
-    """Run sql code to the database pool."""
+    """Run sql code to the database pool.
 
-    query = boxed.parse_code(code=query)
+    `SELECT`, `VALUES` and `TABLE` rows are streamed through a read-only cursor
+    up to `--limit`, Other statements are ran in full and only their first
+    `--limit` rows are shown. `--explain` shows the query plan from
+    `EXPLAIN ANALYZE` instead without keeping its changes.
+    """
+
+    query = boxed.parse_code(code=query).strip().rstrip(";")
 
     try:
-        result = await pool.partial.fetch(query)
+        if explain:
+            plan = await pool.partial.explain(query, analyze=True, timeout=_SQL_TIMEOUT)
+            await ctx.respond(boxed.with_block(plan[:1980], lang=""))
+            return
+
+        rows = await asyncio.wait_for(
+            _collect_rows(pool.partial, query, limit), _SQL_TIMEOUT
+        )
+
         # SQL Code error
     except Exception:
         raise tanjun.CommandError(boxed.with_block(sys.exc_info()[1]))
 
-    if not result:
+    if not rows:
         await ctx.respond("Nothing found.", delete_after=5)
         return
 
-    await ctx.respond(boxed.with_block(result))
+    capped = len(rows) > limit
+    rows = rows[:limit]
+    footer = f"{len(rows)} rows" + (f", Capped at {limit}" if capped else "")
+    pages = _table_pages(
+        tuple(rows[0].keys()), [tuple(row.values()) for row in rows], footer
+    )
+    await boxed.generate_component(ctx, pages, component_client)
+
+
+@tanjun.with_owner_check(halt_execution=True)
+@tanjun.with_argument("limit", converters=int, default=10)
+@tanjun.with_parser
+@tanjun.as_message_command("queries")
+async def top_queries(
+    ctx: tanjun.abc.MessageContext,
+    limit: int,
+    pool: alluka.Injected[traits.PoolRunner],
+) -> None:
+    """View the queries that took the most time in total."""
+
+    if not (queries := pool.partial.metrics()):
+        await ctx.respond("No queries were ran yet.", delete_after=5)
+        return
+
+    top = sorted(queries.items(), key=lambda q: q[1].latency.total, reverse=True)
+    await ctx.respond(
+        boxed.with_block(
+            "\n".join(
+                f"{stats.latency.count}x total={stats.latency.total:.0f}ms "
+                f"p50={stats.latency.p50:.1f}ms p99={stats.latency.p99:.1f}ms "
+                f"wait_p99={stats.pool_wait.p99:.1f}ms errors={stats.errors}\n"
+                f"  {query[:120]}"
+                for query, stats in top[:limit]
+            ),
+            lang="css",
+        )
+    )
+
+
+@tanjun.with_owner_check(halt_execution=True)
+@tanjun.as_message_command("pool")
+async def pool_stats(
+    ctx: tanjun.abc.MessageContext,
+    pool: alluka.Injected[traits.PoolRunner],
+) -> None:
+    """View how saturated the database connection pools are."""
+
+    await ctx.respond(
+        boxed.with_block(
+            "\n".join(
+                f"{name}::size={stats.size}/{stats.max_size} idle={stats.idle} "
+                f"waiting={stats.waiting} timeouts={stats.timeouts}\n"
+                f"  acquire p50={stats.acquire_wait.p50:.1f}ms "
+                f"p99={stats.acquire_wait.p99:.1f}ms max={stats.acquire_wait.max:.1f}ms"
+                for name, stats in pool.partial.stats().items()
+            ),
+            lang="css",
+        )
+    )
 
 
 @tanjun.with_guild_check
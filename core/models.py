@@ -25,7 +25,7 @@
 
 from __future__ import annotations
 
-__all__ = ("Membership", "Tokens")
+__all__ = ("Membership", "Tokens", "Animal")
 
 import typing
 
@@ -35,7 +35,8 @@ import hikari
 if typing.TYPE_CHECKING:
     import collections.abc as collections
     import datetime
-    from typing import Self
+
+_T = typing.TypeVar("_T")
 
 
 class Tokens(typing.TypedDict):
@@ -57,12 +58,50 @@ class Membership:
     code: int
     membership_type: str
 
-    @classmethod
-    def as_membership(cls, response: collections.Mapping[str, typing.Any]) -> Self:
-        return cls(
-            ctx_id=hikari.Snowflake(response["ctx_id"]),
-            membership_id=response["membership_id"],
-            name=response["name"],
-            code=response["code"],
-            membership_type=response["membership_type"],
-        )
+    @staticmethod
+    def from_row(row: collections.Iterable[typing.Any], /) -> Membership:
+        """Build a membership from a row which has its columns in the fields order."""
+        return _membership_from_row(row)
+
+    @staticmethod
+    def from_rows(
+        rows: collections.Iterable[collections.Iterable[typing.Any]], /
+    ) -> collections.Iterator[Membership]:
+        """Lazily build a membership from each row, Only when it's iterated over."""
+        return map(_membership_from_row, rows)
+
+
+@attrs.frozen(kw_only=True, weakref_slot=False)
+class Animal:
+    """A random animal image and a fact about it, Decoded straight from the response."""
+
+    fact: str
+    image: str
+
+
+def _row_constructor(
+    cls: type[_T], /, **converters: collections.Callable[[typing.Any], typing.Any]
+) -> collections.Callable[[collections.Iterable[typing.Any]], _T]:
+    """Generate a function which builds `cls` from a row of its fields in order.
+
+    The row is unpacked positionally and each value is set straight to its slot,
+    Which skips the keyword arguments and the frozen `__setattr__` of `__init__`.
+    """
+    names = [field.name for field in attrs.fields(cls)]
+    namespace: dict[str, typing.Any] = {"_new": object.__new__, "_cls": cls}
+    lines = ["def from_row(row, /):", f"    {', '.join(names)}, = row"]
+    lines.append("    self = _new(_cls)")
+    for name in names:
+        namespace[f"_set_{name}"] = getattr(cls, name).__set__
+        value = name
+        if name in converters:
+            namespace[f"_convert_{name}"] = converters[name]
+            value = f"_convert_{name}({name})"
+        lines.append(f"    _set_{name}(self, {value})")
+    lines.append("    return self")
+
+    exec("\n".join(lines), namespace)
+    return namespace["from_row"]
+
+
+_membership_from_row = _row_constructor(Membership, ctx_id=hikari.Snowflake)
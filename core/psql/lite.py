@@ -0,0 +1,351 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""An embedded SQLite database backend for single node deployments."""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("PartialLite", "SqlitePool")
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import pathlib
+import re
+import sqlite3
+import time
+import typing
+
+from hikari import iterators
+
+from core import models
+from core.std import config, metrics, traits
+
+from . import pool
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+    import aiobungie
+    from hikari import snowflakes
+
+    _T = typing.TypeVar("_T")
+
+_LOG: typing.Final[logging.Logger] = logging.getLogger("fated.lite")
+# Postgres' $n parameters, SQLite has the same numbered ?n parameters.
+_PARAMETERS: typing.Final[re.Pattern[str]] = re.compile(r"\$(\d+)")
+
+
+@functools.lru_cache(maxsize=256)
+def _translate(sql: str) -> str:
+    return _PARAMETERS.sub(r"?\1", sql)
+
+
+class _Row(sqlite3.Row):
+    """A row that's read like `asyncpg.Record`, By position, column or as a mapping."""
+
+    __slots__ = ()
+
+    def values(self) -> tuple[typing.Any, ...]:
+        return tuple(self)
+
+    def items(self) -> list[tuple[str, typing.Any]]:
+        return list(zip(self.keys(), self))
+
+
+class PartialLite(traits.PartialPool):
+    """A SQLite database that runs all of its queries on a single dedicated thread.
+
+    The database uses write-ahead logging so reads don't block on writes,
+    And every statement is committed on its own.
+    """
+
+    __slots__ = (
+        "_path",
+        "_config",
+        "_conn",
+        "_executor",
+        "_metrics",
+        "_inflight",
+        "_queue_wait",
+    )
+
+    def __init__(self, cfg: config.Config) -> None:
+        self._path = cfg.SQLITE_PATH
+        self._config = cfg
+        self._conn: sqlite3.Connection | None = None
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._metrics: dict[str, pool.QueryMetrics] = {}
+        self._inflight = 0
+        self._queue_wait = metrics.Histogram()
+
+    def __repr__(self) -> str:
+        return f"<PartialLite(path: {self._path!r}, open: {self._conn is not None})>"
+
+    tables = staticmethod(pool.PartialPool.tables)
+
+    def metrics(self) -> collections.Mapping[str, pool.QueryMetrics]:
+        return self._metrics.copy()
+
+    def stats(self) -> collections.Mapping[str, pool.PoolStats]:
+        # A single connection, Everything else queues up on the database thread.
+        size = int(self._conn is not None)
+        return {
+            "primary": pool.PoolStats(
+                size=size,
+                idle=size if not self._inflight else 0,
+                max_size=1,
+                waiting=max(self._inflight - 1, 0),
+                timeouts=0,
+                acquire_wait=self._queue_wait,
+            )
+        }
+
+    async def open(
+        self, build: bool = False, schema_path: pathlib.Path | None = None
+    ) -> None:
+        """Opens the database file and create the tables if build is True."""
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fated-sqlite"
+        )
+        self._conn = await self._submit(self._connect)
+        _LOG.debug("Opened the SQLite database %s.", self._path)
+
+        if build:
+            tables = self.tables(schema_path)
+            await self._submit(lambda: self._get_conn().executescript(tables))
+            _LOG.info("Tables build success.")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Created on the worker thread since SQLite connections are bound to their thread.
+        conn = sqlite3.connect(self._path, isolation_level=None)
+        conn.row_factory = _Row
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        conn.execute("PRAGMA busy_timeout = 5000;")
+        return conn
+
+    async def close(self) -> None:
+        if self._conn is None or self._executor is None:
+            raise RuntimeError("Can't close database not opened.")
+
+        await self._submit(self._conn.close)
+        self._executor.shutdown(wait=True)
+        self._conn = self._executor = None
+        _LOG.debug("SQLite database closed.")
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn:
+            return self._conn
+
+        raise RuntimeError("Can't return database not opened.")
+
+    async def _submit(self, fn: collections.Callable[[], _T]) -> _T:
+        if self._executor is None:
+            raise RuntimeError("Can't run queries on database not opened.")
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    async def _run(
+        self, sql: str, fn: collections.Callable[[sqlite3.Connection], _T]
+    ) -> _T:
+        """Run this on the database thread and record the query's timings."""
+        key, stats = pool.track_query(self._metrics, sql)
+
+        def run() -> tuple[float, _T]:
+            started = time.perf_counter()
+            return started, fn(self._get_conn())
+
+        queued = time.perf_counter()
+        self._inflight += 1
+        try:
+            started, result = await self._submit(run)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            self._inflight -= 1
+
+        elapsed = (time.perf_counter() - started) * 1_000
+        # The time spent waiting for the thread to pick the query up.
+        waited = (started - queued) * 1_000
+        stats.pool_wait.observe(waited)
+        self._queue_wait.observe(waited)
+        stats.latency.observe(elapsed)
+        if elapsed >= self._config.DB_SLOW_QUERY_MS:
+            _LOG.warning("Slow query took %.1fms: %s", elapsed, key)
+
+        return result
+
+    def listen(
+        self, channel: str, callback: collections.Callable[[str | None], None], /
+    ) -> None:
+        # Only this process writes to the database, There's nothing to listen to.
+        return None
+
+    async def execute(
+        self, sql: str, /, *args: typing.Any, timeout: float | None = None
+    ) -> None:
+        await self._run(sql, lambda conn: conn.execute(_translate(sql), args))
+
+    async def fetch(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        timeout: float | None = None,
+        fresh: bool = False,
+    ) -> list[typing.Any]:
+        return await self._run(
+            sql, lambda conn: conn.execute(_translate(sql), args).fetchall()
+        )
+
+    async def fetchrow(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        timeout: float | None = None,
+        fresh: bool = False,
+    ) -> list[typing.Any] | collections.Mapping[str, typing.Any] | tuple[typing.Any]:
+        return await self._run(
+            sql, lambda conn: conn.execute(_translate(sql), args).fetchone()
+        )
+
+    async def fetchval(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        column: int | None = 0,
+        timeout: float | None = None,
+        fresh: bool = False,
+    ) -> typing.Any:
+        row: _Row | None = await self._run(
+            sql, lambda conn: conn.execute(_translate(sql), args).fetchone()
+        )
+        return None if row is None else row[column or 0]
+
+    async def explain(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        analyze: bool = False,
+        timeout: float | None = None,
+    ) -> str:
+        # SQLite can only show the plan without running the query.
+        plan = await self.fetch(f"EXPLAIN QUERY PLAN {sql}", *args)
+        return "\n".join(row["detail"] for row in plan)
+
+    async def cursor(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        prefetch: int | None = None,
+        timeout: float | None = None,
+    ) -> collections.AsyncGenerator[_Row, None]:
+        cursor = await self._run(sql, lambda conn: conn.execute(_translate(sql), args))
+        try:
+            while rows := await self._submit(
+                functools.partial(cursor.fetchmany, prefetch or 100)
+            ):
+                for row in rows:
+                    yield row
+        finally:
+            await self._submit(cursor.close)
+
+
+@typing.final
+class SqlitePool(traits.PoolRunner):
+    """A SQLite `PoolRunner` for deployments that don't need a Postgres server."""
+
+    __slots__: tuple[str, ...] = ("_pool",)
+
+    def __init__(self, cfg: config.Config) -> None:
+        self._pool = PartialLite(cfg)
+
+    def __repr__(self) -> str:
+        return f"<SqlitePool(ref: {self._pool!r})>"
+
+    @property
+    def partial(self) -> traits.PartialPool:
+        return self._pool
+
+    async def open(self) -> None:
+        # There's no separate server to build the tables on beforehand.
+        await self._pool.open(build=True)
+
+    async def close(self) -> None:
+        await self._pool.close()
+
+    async def fetch_destiny_member(
+        self, user_id: snowflakes.Snowflake
+    ) -> models.Membership:
+        query = await self._pool.fetchrow(pool.Query.FETCH_MEMBER, int(user_id))
+        if not query:
+            raise pool.ExistsError(f"User <@!{user_id}> not found.")
+
+        return models.Membership.from_row(query)
+
+    async def fetch_destiny_members(self) -> iterators.LazyIterator[models.Membership]:
+        query = await self._pool.fetch(pool.Query.FETCH_MEMBERS)
+        if not query:
+            raise pool.ExistsError("No users found in Destiny tables.")
+
+        return iterators.FlatLazyIterator(models.Membership.from_rows(query))
+
+    def stream_destiny_members(
+        self, *, prefetch: int = 100
+    ) -> iterators.LazyIterator[models.Membership]:
+        return pool.MembershipStream(
+            self._pool.cursor(pool.Query.FETCH_MEMBERS, prefetch=prefetch)
+        )
+
+    async def put_destiny_member(
+        self,
+        user_id: snowflakes.Snowflake,
+        membership_id: int,
+        name: str,
+        code: int,
+        membership_type: aiobungie.MembershipType,
+    ) -> None:
+        try:
+            await self._pool.execute(
+                pool.Query.PUT_MEMBER,
+                int(user_id),
+                membership_id,
+                name,
+                code,
+                membership_type.name.title(),
+            )
+        except sqlite3.IntegrityError as exc:
+            # CHECK constraints fail with an IntegrityError as well.
+            if not str(exc).startswith("UNIQUE"):
+                raise
+            raise pool.ExistsError(f"User {user_id}:{name} exists.")
+
+    async def remove_destiny_member(self, user_id: snowflakes.Snowflake) -> None:
+        await self._pool.execute(pool.Query.REMOVE_MEMBER, int(user_id))
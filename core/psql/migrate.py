@@ -0,0 +1,149 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Versioned schema migrations on top of the base tables."""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Migration", "load", "apply")
+
+import logging
+import pathlib
+import re
+import typing
+
+import attrs
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+    import asyncpg
+
+_LOG: typing.Final[logging.Logger] = logging.getLogger("fated.migrate")
+_FILE_NAME: typing.Final[re.Pattern[str]] = re.compile(r"^(\d+)_(\w+)\.sql$")
+# Migrations with this line are ran statement by statement outside of a transaction,
+# i.e., `CREATE INDEX CONCURRENTLY`.
+_NO_TRANSACTION: typing.Final[str] = "-- migrate:no-transaction"
+# Held while migrating so multiple processes don't run the same migrations.
+_LOCK_KEY: typing.Final[int] = 0x66617465
+_VERSIONS_TABLE: typing.Final[str] = (
+    "CREATE TABLE IF NOT EXISTS SchemaVersion ("
+    "version INTEGER PRIMARY KEY, "
+    "name TEXT NOT NULL, "
+    "applied_at TIMESTAMPTZ NOT NULL DEFAULT now());"
+)
+
+
+@attrs.frozen(weakref_slot=False)
+class Migration:
+    """A single numbered migration file."""
+
+    version: int
+    name: str
+    sql: str = attrs.field(repr=False)
+
+    @property
+    def transactional(self) -> bool:
+        return _NO_TRANSACTION not in self.sql
+
+    def statements(self) -> list[str]:
+        """The migration's statements, Split on the `;` that end a line."""
+        return [
+            statement
+            for statement in re.split(r";\s*$", self.sql, flags=re.MULTILINE)
+            if statement.strip() and not _is_comment(statement)
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.version:04d}_{self.name}"
+
+
+def _is_comment(statement: str) -> bool:
+    sql = re.sub(r"/\*.*?\*/", "", statement, flags=re.DOTALL)
+    return all(
+        not line.strip() or line.strip().startswith("--") for line in sql.splitlines()
+    )
+
+
+def load(path: pathlib.Path | None = None) -> list[Migration]:
+    """Load the migrations in this directory sorted by their version."""
+    path = path or pathlib.Path("core") / "psql" / "migrations"
+    if not path.is_dir():
+        raise FileNotFoundError(f"Migrations directory not found in {path!r}")
+
+    migrations: dict[int, Migration] = {}
+    for file in path.glob("*.sql"):
+        if (match := _FILE_NAME.match(file.name)) is None:
+            _LOG.warning("Ignoring migration file %s, Expected NNNN_name.sql", file)
+            continue
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version} in {file}")
+
+        migrations[version] = Migration(version, match.group(2), file.read_text())
+
+    return sorted(migrations.values(), key=lambda migration: migration.version)
+
+
+async def apply(
+    conn: asyncpg.Connection, migrations: collections.Iterable[Migration]
+) -> list[Migration]:
+    """Apply the migrations that weren't applied yet, Returning them."""
+    await conn.execute(_VERSIONS_TABLE)
+    await conn.execute("SELECT pg_advisory_lock($1);", _LOCK_KEY)
+    try:
+        applied = {
+            record["version"]
+            for record in await conn.fetch("SELECT version FROM SchemaVersion;")
+        }
+        done: list[Migration] = []
+
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+
+            _LOG.info("Applying migration %s.", migration)
+            if migration.transactional:
+                async with conn.transaction():
+                    await conn.execute(migration.sql)
+                    await _record(conn, migration)
+            else:
+                for statement in migration.statements():
+                    await conn.execute(statement)
+                await _record(conn, migration)
+
+            done.append(migration)
+
+        return done
+
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1);", _LOCK_KEY)
+
+
+async def _record(conn: asyncpg.Connection, migration: Migration) -> None:
+    await conn.execute(
+        "INSERT INTO SchemaVersion(version, name) VALUES($1, $2);",
+        migration.version,
+        migration.name,
+    )
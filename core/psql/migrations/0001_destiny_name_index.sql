@@ -0,0 +1,30 @@
+/*
+MIT License
+
+Copyright (c) 2021 - Present nxtlo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE. */
+
+-- migrate:no-transaction
+-- Case insensitive name lookups. Built concurrently so writes to the table aren't blocked,
+-- An interrupted build leaves an invalid index behind which gets dropped on the next run.
+-- `membership_id` is already indexed by its UNIQUE constraint.
+
+DROP INDEX CONCURRENTLY IF EXISTS destiny_lower_name_idx;
+CREATE INDEX CONCURRENTLY destiny_lower_name_idx ON Destiny (lower(name));
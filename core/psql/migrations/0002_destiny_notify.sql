@@ -0,0 +1,54 @@
+/*
+MIT License
+
+Copyright (c) 2021 - Present nxtlo
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE. */
+
+-- Notifies `destiny_changes` with `<operation>:<ctx_id>` whenever a membership changes
+-- So the caches of every running process can drop it.
+
+CREATE OR REPLACE FUNCTION destiny_notify() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        PERFORM pg_notify('destiny_changes', TG_OP);
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM pg_notify('destiny_changes', TG_OP || ':' || OLD.ctx_id);
+    END IF;
+
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.ctx_id <> OLD.ctx_id) THEN
+        PERFORM pg_notify('destiny_changes', TG_OP || ':' || NEW.ctx_id);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS destiny_notify_rows ON Destiny;
+CREATE TRIGGER destiny_notify_rows
+    AFTER INSERT OR UPDATE OR DELETE ON Destiny
+    FOR EACH ROW EXECUTE FUNCTION destiny_notify();
+
+DROP TRIGGER IF EXISTS destiny_notify_truncate ON Destiny;
+CREATE TRIGGER destiny_notify_truncate
+    AFTER TRUNCATE ON Destiny
+    FOR EACH STATEMENT EXECUTE FUNCTION destiny_notify();
@@ -23,18 +23,42 @@
 
 from __future__ import annotations
 
-__all__: tuple[str, ...] = ("PgxPool", "PartialPool")
+__all__: tuple[str, ...] = (
+    "MembershipStream",
+    "PgxPool",
+    "PartialPool",
+    "PoolExhaustedError",
+    "PoolStats",
+    "Query",
+    "QueryMetrics",
+    "WriteBehind",
+    "track_query",
+)
 
+import asyncio
+import contextlib
+import enum
+import functools
+import itertools
 import logging
+import os
 import pathlib
+import re
+import secrets
+import time
 import typing
 
 import asyncpg
 import asyncpg.exceptions
+import attrs
+import hikari
 from hikari import iterators
+from yuyo import backoff
 
 from core import models
-from core.std import config, traits
+from core.std import cache, config, metrics, traits
+
+from . import migrate
 
 if typing.TYPE_CHECKING:
     import collections.abc as collections
@@ -43,6 +67,52 @@ if typing.TYPE_CHECKING:
     from hikari import snowflakes
 
 _LOG: typing.Final[logging.Logger] = logging.getLogger("fated.pool")
+# Users who are not synced are cached for less time than the synced ones
+# since they're more likely to sync soon after a failed lookup.
+_NEGATIVE_TTL: typing.Final[float] = 30.0
+# How long a membership is read from the primary after it was invalidated,
+# The replicas may not have the change yet.
+_FRESH_WINDOW: typing.Final[float] = 5.0
+_MISSING: typing.Final[typing.Any] = object()
+# Literal strings and numbers, But not the $n parameters.
+_LITERALS: typing.Final[re.Pattern[str]] = re.compile(
+    r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?"
+)
+# Stop tracking new queries past this, i.e., Many ad-hoc owner queries.
+_MAX_TRACKED_QUERIES: typing.Final[int] = 256
+# Statements that are safe to run on a read replica.
+_READ_STATEMENTS: typing.Final[tuple[str, ...]] = ("select", "values", "table", "show")
+# Connection errors after which a read is retried on the primary.
+_FAILOVER_ERRORS: typing.Final[tuple[type[BaseException], ...]] = (
+    OSError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+)
+# Different classes before Python 3.11, The builtin one is an `OSError` as well.
+_TIMEOUT_ERRORS: typing.Final[tuple[type[BaseException], ...]] = (
+    TimeoutError,
+    asyncio.TimeoutError,
+)
+# How long a failed replica is skipped for in seconds.
+_REPLICA_COOLDOWN: typing.Final[float] = 30.0
+_Hook: typing.TypeAlias = (
+    "collections.Callable[[asyncpg.Connection], collections.Awaitable[typing.Any]]"
+)
+# Called with a notification's payload, Or `None` when notifications may have been missed.
+_Notify: typing.TypeAlias = "collections.Callable[[str | None], None]"
+# How often the listener connection is checked while there're no notifications.
+_LISTENER_HEARTBEAT: typing.Final[float] = 30.0
+_DESTINY_CHANNEL: typing.Final[str] = "destiny_changes"
+# Set on this process' connections and sent back with the changes they make.
+_ORIGIN: typing.Final[str] = f"{os.getpid()}-{secrets.token_hex(4)}"
+_DESTINY_COLUMNS: typing.Final[tuple[str, ...]] = (
+    "ctx_id",
+    "membership_id",
+    "name",
+    "code",
+    "membership_type",
+)
 
 
 class ExistsError(RuntimeError):
@@ -61,18 +131,183 @@ class ExistsError(RuntimeError):
         return self.message
 
 
+class PoolExhaustedError(TimeoutError):
+    """Raised when no connection could be acquired from a pool in time."""
+
+    __slots__ = ("stats",)
+
+    def __init__(self, timeout: float, stats: PoolStats) -> None:
+        super().__init__(
+            f"Timed out after {timeout}s waiting for a database connection, "
+            f"{stats.size - stats.idle}/{stats.max_size} connections are in use "
+            f"with {stats.waiting} queries waiting."
+        )
+        self.stats = stats
+
+
+class Query(str, enum.Enum):
+    """Named queries that stay prepared on every connection after their first use.
+
+    They're kept in each connection's statement cache, Which holds up to
+    `DB_STATEMENT_CACHE_SIZE` statements and re-prepares them once the table changes.
+    """
+
+    # The columns are selected in the fields order of `models.Membership`.
+    FETCH_MEMBER = (
+        "SELECT ctx_id, membership_id, name, code, membership_type "
+        "FROM Destiny WHERE ctx_id = $1;"
+    )
+    FETCH_MEMBERS = (
+        "SELECT ctx_id, membership_id, name, code, membership_type FROM Destiny;"
+    )
+    PUT_MEMBER = (
+        "INSERT INTO Destiny(ctx_id, membership_id, name, code, membership_type) "
+        "VALUES($1, $2, $3, $4, $5)"
+    )
+    REMOVE_MEMBER = "DELETE FROM Destiny WHERE ctx_id = $1"
+    PUT_MEMBERS = (
+        "INSERT INTO Destiny(ctx_id, membership_id, name, code, membership_type) "
+        "SELECT * FROM unnest($1::BIGINT[], $2::BIGINT[], $3::TEXT[], $4::SMALLINT[], "
+        "$5::VARCHAR(6)[]) ON CONFLICT DO NOTHING RETURNING ctx_id;"
+    )
+    REMOVE_MEMBERS = "DELETE FROM Destiny WHERE ctx_id = ANY($1::BIGINT[]);"
+
+
+@functools.lru_cache(maxsize=_MAX_TRACKED_QUERIES)
+def _normalize(sql: str) -> str:
+    return " ".join(_LITERALS.sub("?", sql).split()).rstrip(";")
+
+
+def track_query(
+    tracked: dict[str, QueryMetrics], sql: str, /
+) -> tuple[str, QueryMetrics]:
+    """Returns the normalized query and the metrics to record its run to.
+
+    Queries past the tracked limit share the `<untracked>` metrics.
+    """
+    key = _normalize(sql)
+    if (stats := tracked.get(key)) is None:
+        if len(tracked) >= _MAX_TRACKED_QUERIES:
+            key = "<untracked>"
+        stats = tracked.setdefault(key, QueryMetrics())
+
+    return key, stats
+
+
+@attrs.define(weakref_slot=False)
+class QueryMetrics:
+    """Metrics recorded for a single normalized query."""
+
+    latency: metrics.Histogram = attrs.field(factory=metrics.Histogram)
+    """How long the query took to run, Excluding the pool wait."""
+    pool_wait: metrics.Histogram = attrs.field(factory=metrics.Histogram)
+    """How long the query waited to acquire a connection."""
+    errors: int = 0
+
+
+@attrs.frozen(weakref_slot=False)
+class PoolStats:
+    """A snapshot of a connection pool's saturation."""
+
+    size: int
+    idle: int
+    max_size: int
+    waiting: int
+    """How many queries are waiting to acquire a connection."""
+    timeouts: int
+    acquire_wait: metrics.Histogram
+
+
+@attrs.define(weakref_slot=False)
+class _Saturation:
+    waiting: int = 0
+    timeouts: int = 0
+    acquire_wait: metrics.Histogram = attrs.field(factory=metrics.Histogram)
+
+
+def _text(sql: str) -> str:
+    # asyncpg only takes exact strings, A `Query`'s text is what it caches by.
+    return sql.value if isinstance(sql, Query) else sql
+
+
+async def _call(
+    conn: asyncpg.Connection,
+    sql: str,
+    method: str,
+    /,
+    *args: typing.Any,
+    **kwargs: typing.Any,
+) -> typing.Any:
+    return await getattr(conn, method)(_text(sql), *args, **kwargs)
+
+
 class PartialPool(traits.PartialPool):
-    """Partial pool implementation. A low-level wrapper around asyncpg.Pool."""
+    """Partial pool implementation. A low-level wrapper around asyncpg.Pool.
+
+    `setup` is called every time a connection is acquired from the pool and
+    `init` once when a new connection is created.
+
+    Reads are sent to the configured read replicas unless `fresh` is passed,
+    Writes and `execute` always run on the primary.
+    """
 
-    __slots__ = ("_pool", "_config")
+    __slots__ = (
+        "_pool",
+        "_config",
+        "_setup",
+        "_init",
+        "_metrics",
+        "_channels",
+        "_listener",
+        "_replicas",
+        "_replicas_down",
+        "_next_replica",
+        "_saturation",
+    )
 
-    def __init__(self, cfg: config.Config) -> None:
+    def __init__(
+        self,
+        cfg: config.Config,
+        *,
+        setup: _Hook | None = None,
+        init: _Hook | None = None,
+    ) -> None:
         self._pool: asyncpg.Pool | None = None
         self._config = cfg
+        self._setup = setup
+        self._init = init
+        self._metrics: dict[str, QueryMetrics] = {}
+        self._channels: dict[str, list[_Notify]] = {}
+        self._listener: asyncio.Task[None] | None = None
+        self._replicas: list[asyncpg.Pool] = []
+        # Index of a failed replica -> when it can be used again.
+        self._replicas_down: dict[int, float] = {}
+        self._next_replica = 0
+        self._saturation: dict[asyncpg.Pool, _Saturation] = {}
 
     def __repr__(self) -> str:
         return hex(id(self._pool))
 
+    def metrics(self) -> collections.Mapping[str, QueryMetrics]:
+        return self._metrics.copy()
+
+    def stats(self) -> collections.Mapping[str, PoolStats]:
+        pools = {"primary": self._get_pool()} | {
+            f"replica-{index}": replica for index, replica in enumerate(self._replicas)
+        }
+        return {name: self._stats_of(pool) for name, pool in pools.items()}
+
+    def _stats_of(self, pool: asyncpg.Pool) -> PoolStats:
+        saturation = self._saturation.setdefault(pool, _Saturation())
+        return PoolStats(
+            size=pool.get_size(),
+            idle=pool.get_idle_size(),
+            max_size=pool.get_max_size(),
+            waiting=saturation.waiting,
+            timeouts=saturation.timeouts,
+            acquire_wait=saturation.acquire_wait,
+        )
+
     @staticmethod
     def tables(path: pathlib.Path | None = None) -> str:
         p = path or pathlib.Path("core") / "psql" / "tables.sql"
@@ -88,15 +323,18 @@ class PartialPool(traits.PartialPool):
     ) -> None:
         """Creates a new connection pool and create the tables if build is True."""
 
-        self._pool = pool = await asyncpg.create_pool(
-            database=self._config.DB_NAME,
-            user=self._config.DB_USER,
-            password=self._config.DB_PASSWORD,
-            host=self._config.DB_HOST,
-            port=self._config.DB_PORT,
-        )
+        self._pool = pool = await self._create_pool(**self._credentials())
         _LOG.debug("Created database pool.")
 
+        for dsn in self._config.DB_REPLICAS:
+            try:
+                self._replicas.append(await self._create_pool(dsn=dsn))
+            except _FAILOVER_ERRORS + _TIMEOUT_ERRORS + (asyncpg.PostgresError,) as exc:
+                _LOG.warning("Skipping a read replica that failed to connect: %s", exc)
+
+        if self._channels:
+            self._listener = asyncio.create_task(self._listen())
+
         if build:
             tables = self.tables(schema_path)
 
@@ -111,26 +349,255 @@ class PartialPool(traits.PartialPool):
                 finally:
                     await pool.release(conn)
 
+    async def _create_pool(self, **credentials: typing.Any) -> asyncpg.Pool:
+        # Only awaiting an already initialized pool returns `None`.
+        pool = await asyncpg.create_pool(
+            **credentials,
+            min_size=self._config.DB_MIN_SIZE,
+            max_size=self._config.DB_MAX_SIZE,
+            max_inactive_connection_lifetime=self._config.DB_MAX_INACTIVE_LIFETIME,
+            statement_cache_size=self._config.DB_STATEMENT_CACHE_SIZE,
+            command_timeout=self._config.DB_COMMAND_TIMEOUT,
+            server_settings={"fated.origin": _ORIGIN},
+            setup=self._setup,
+            init=self._init,
+        )
+        assert pool is not None
+        return pool
+
+    async def migrate(
+        self, path: pathlib.Path | None = None
+    ) -> list[migrate.Migration]:
+        """Apply the pending schema migrations, Returns the applied ones."""
+        migrations = migrate.load(path)
+        async with self._get_pool().acquire() as conn:
+            return await migrate.apply(conn, migrations)
+
     async def close(self) -> None:
         if self._pool is None:
             raise RuntimeError("Can't close pool not created.")
 
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+        await asyncio.gather(*(replica.close() for replica in self._replicas))
+        self._replicas.clear()
+        self._replicas_down.clear()
+        self._saturation.clear()
+
         await self._pool.close()
         _LOG.debug("Database pool closed.")
         self._pool = None
 
+    def _credentials(self) -> dict[str, typing.Any]:
+        return {
+            "database": self._config.DB_NAME,
+            "user": self._config.DB_USER,
+            "password": self._config.DB_PASSWORD,
+            "host": self._config.DB_HOST,
+            "port": self._config.DB_PORT,
+        }
+
+    def listen(self, channel: str, callback: _Notify, /) -> None:
+        """Call `callback` with the payload of every notification sent to this channel.
+
+        Notifications are received on a dedicated connection which reconnects by
+        itself. Since notifications may be missed while it's disconnected,
+        The callbacks are called with `None` once it's lost and again once it's back.
+        """
+        self._channels.setdefault(channel, []).append(callback)
+
+        # Restart the listener so it listens to the new channel as well.
+        if self._listener is not None:
+            self._listener.cancel()
+        if self._pool is not None:
+            self._listener = asyncio.create_task(self._listen())
+
+    def _on_notification(
+        self, _: typing.Any, __: int, channel: str, payload: str
+    ) -> None:
+        self._notify(channel, payload)
+
+    def _notify(self, channel: str, payload: str | None) -> None:
+        for callback in self._channels.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                _LOG.exception("Notification callback for %s failed.", channel)
+
+    def _resync(self) -> None:
+        for channel in self._channels:
+            self._notify(channel, None)
+
+    async def _listen(self) -> None:
+        backoff_ = backoff.Backoff(maximum=30.0)
+        connected_before = False
+
+        async for _ in backoff_:
+            try:
+                conn: asyncpg.Connection = await asyncpg.connect(**self._credentials())
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as exc:
+                _LOG.warning("Couldn't connect the listener: %s", exc)
+                continue
+
+            lost = asyncio.Event()
+            # Bound now since a terminated connection may call it after the next connect.
+            conn.add_termination_listener(lambda _, lost=lost: lost.set())
+            try:
+                for channel in self._channels:
+                    await conn.add_listener(channel, self._on_notification)
+
+                if connected_before:
+                    _LOG.info("Listener reconnected, Resyncing.")
+                    self._resync()
+
+                connected_before = True
+                backoff_.reset()
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), _LISTENER_HEARTBEAT)
+                    except asyncio.TimeoutError:
+                        await conn.execute("SELECT 1;", timeout=5.0)
+
+                _LOG.warning("Listener connection closed.")
+
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                asyncpg.PostgresError,
+                asyncpg.InterfaceError,
+            ) as exc:
+                _LOG.warning("Listener connection lost: %s", exc)
+
+            finally:
+                conn.terminate()
+
+            self._resync()
+
     def _get_pool(self) -> asyncpg.Pool:
         if self._pool:
             return self._pool
 
         raise RuntimeError("Can't return pool not created.")
 
+    def _pick_replica(self) -> tuple[int, asyncpg.Pool] | None:
+        now = time.monotonic()
+        available = [
+            (index, replica)
+            for index, replica in enumerate(self._replicas)
+            if self._replicas_down.get(index, 0.0) <= now
+        ]
+        if not available:
+            return None
+
+        if self._config.DB_REPLICA_SELECTION == "least-loaded":
+            return min(
+                available,
+                key=lambda replica: replica[1].get_size() - replica[1].get_idle_size(),
+            )
+
+        self._next_replica += 1
+        return available[self._next_replica % len(available)]
+
+    async def _read(
+        self,
+        sql: str,
+        method: str,
+        /,
+        *args: typing.Any,
+        fresh: bool,
+        **kwargs: typing.Any,
+    ) -> typing.Any:
+        """Run a read on a replica if possible, Falling back to the primary."""
+        if (
+            not fresh
+            and sql.lstrip().lower().startswith(_READ_STATEMENTS)
+            and (picked := self._pick_replica()) is not None
+        ):
+            index, replica = picked
+            try:
+                async with self._acquire(sql, replica) as conn:
+                    return await _call(conn, sql, method, *args, **kwargs)
+
+            except PoolExhaustedError as exc:
+                # A saturated replica is still up.
+                _LOG.warning(
+                    "Read replica %d is exhausted, Using the primary: %s", index, exc
+                )
+
+            except _TIMEOUT_ERRORS:
+                # The statement itself timed out, It'd take as long on the primary.
+                raise
+
+            except _FAILOVER_ERRORS as exc:
+                self._replicas_down[index] = time.monotonic() + _REPLICA_COOLDOWN
+                _LOG.warning(
+                    "Read replica %d failed, Using the primary: %s", index, exc
+                )
+
+        async with self._acquire(sql) as conn:
+            return await _call(conn, sql, method, *args, **kwargs)
+
+    @contextlib.asynccontextmanager
+    async def _acquire(
+        self, sql: str, pool: asyncpg.Pool | None = None
+    ) -> collections.AsyncGenerator[asyncpg.Connection, None]:
+        """Acquire a connection to run this query on and record its timings."""
+        key, stats = track_query(self._metrics, sql)
+        pool = pool or self._get_pool()
+        saturation = self._saturation.setdefault(pool, _Saturation())
+        timeout = self._config.DB_ACQUIRE_TIMEOUT
+
+        started = time.perf_counter()
+        saturation.waiting += 1
+        try:
+            conn = await pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            saturation.timeouts += 1
+            raise PoolExhaustedError(timeout, self._stats_of(pool)) from None
+        finally:
+            saturation.waiting -= 1
+
+        acquired = time.perf_counter()
+        wait = (acquired - started) * 1_000
+        stats.pool_wait.observe(wait)
+        saturation.acquire_wait.observe(wait)
+        try:
+            try:
+                yield conn
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                elapsed = (time.perf_counter() - acquired) * 1_000
+                stats.latency.observe(elapsed)
+                if elapsed >= self._config.DB_SLOW_QUERY_MS:
+                    _LOG.warning(
+                        "Slow query took %.1fms, Waited %.1fms for a connection: %s",
+                        elapsed,
+                        wait,
+                        key,
+                    )
+        finally:
+            await pool.release(conn)
+
+    def acquire(
+        self, label: str, /
+    ) -> contextlib.AbstractAsyncContextManager[asyncpg.Connection]:
+        """Acquire a primary connection for work that isn't a single query, i.e., `COPY`.
+
+        Its timings are recorded under this label.
+        """
+        return self._acquire(label)
+
     async def execute(
         self, sql: str, /, *args: typing.Any, timeout: float | None = None
     ) -> None:
-        async with self._get_pool().acquire() as conn:
+        async with self._acquire(sql) as conn:
             await conn.execute(
-                sql, *args, timeout=typing.cast(float, timeout)
+                _text(sql), *args, timeout=typing.cast(float, timeout)
             )  # asyncpg has weird typings.
 
     async def fetch(
@@ -139,9 +606,9 @@ class PartialPool(traits.PartialPool):
         /,
         *args: typing.Any,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> list[typing.Any]:
-        async with self._get_pool().acquire() as conn:
-            return await conn.fetch(sql, *args, timeout=timeout)
+        return await self._read(sql, "fetch", *args, fresh=fresh, timeout=timeout)
 
     async def fetchrow(
         self,
@@ -149,9 +616,9 @@ class PartialPool(traits.PartialPool):
         /,
         *args: typing.Any,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> list[typing.Any] | collections.Mapping[str, typing.Any] | tuple[typing.Any]:
-        async with self._get_pool().acquire() as conn:
-            return await conn.fetchrow(sql, *args, timeout=timeout)
+        return await self._read(sql, "fetchrow", *args, fresh=fresh, timeout=timeout)
 
     async def fetchval(
         self,
@@ -160,45 +627,374 @@ class PartialPool(traits.PartialPool):
         *args: typing.Any,
         column: int | None = 0,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> typing.Any:
-        async with self._get_pool().acquire() as conn:
-            return await conn.fetchval(sql, *args, column=column, timeout=timeout)
+        return await self._read(
+            sql, "fetchval", *args, fresh=fresh, column=column, timeout=timeout
+        )
+
+    async def explain(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        analyze: bool = False,
+        timeout: float | None = None,
+    ) -> str:
+        """Returns the query plan of a query.
+
+        `ANALYZE` runs the query, So it's ran in a transaction that's always rolled back.
+        """
+        options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+        async with self._acquire(sql) as conn:
+            transaction = conn.transaction()
+            await transaction.start()
+            try:
+                plan = await conn.fetch(
+                    f"EXPLAIN ({options}) {sql}", *args, timeout=timeout
+                )
+            finally:
+                await transaction.rollback()
+
+        return "\n".join(row[0] for row in plan)
+
+    async def cursor(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        prefetch: int | None = None,
+        timeout: float | None = None,
+    ) -> collections.AsyncGenerator[collections.Mapping[str, typing.Any], None]:
+        # The connection is held until the iteration is either exhausted or closed.
+        # Read-only since stopping early rolls the transaction back, So a statement
+        # that writes fails instead of seemingly succeeding without its changes.
+        async with self._acquire(sql) as conn, conn.transaction(readonly=True):
+            cursor = conn.cursor(_text(sql), *args, prefetch=prefetch, timeout=timeout)
+            async for record in cursor:
+                yield record
+
+
+# ctx_id, membership_id, name, code, membership_type
+_Record: typing.TypeAlias = "tuple[int, int, str, int, str]"
+# Whether it's an insert, the record or ctx_id to delete and its waiter.
+_Write: typing.TypeAlias = "tuple[bool, typing.Any, asyncio.Future[None]]"
+
+
+def _resolve(future: asyncio.Future[None], exc: BaseException | None = None) -> None:
+    # The writer may have stopped waiting, The write still happens anyways.
+    if future.done():
+        return
+
+    if exc is None:
+        future.set_result(None)
+    else:
+        future.set_exception(exc)
+
+
+@typing.final
+class WriteBehind:
+    """Groups Destiny membership writes into batches that are flushed together.
+
+    A batch is flushed once it has `max_size` writes or `delay` seconds after
+    its first write, Whichever comes first. Writers wait until their batch
+    is flushed, Batches are flushed in the same order they were made.
+    """
+
+    __slots__: tuple[str, ...] = (
+        "_pool",
+        "_max_size",
+        "_delay",
+        "_pending",
+        "_timer",
+        "_lock",
+        "_tasks",
+    )
+
+    def __init__(
+        self, pool: traits.PartialPool, /, *, max_size: int = 100, delay: float = 0.05
+    ) -> None:
+        self._pool = pool
+        self._max_size = max_size
+        self._delay = delay
+        self._pending: list[_Write] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def __repr__(self) -> str:
+        return f"<WriteBehind(pending: {len(self._pending)}, flushing: {len(self._tasks)})>"
+
+    async def insert(self, record: _Record) -> None:
+        """Insert a membership, Raises `ExistsError` if it already exists."""
+        await self._submit(True, record)
+
+    async def delete(self, ctx_id: int) -> None:
+        await self._submit(False, ctx_id)
+
+    def flush(self) -> None:
+        """Start flushing the pending writes without waiting for the batch to fill."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.create_task(self._flush(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Flush the pending writes and wait for all the batches to finish."""
+        self.flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _submit(self, insert: bool, value: typing.Any) -> None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((insert, value, future))
+
+        if len(self._pending) >= self._max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._delay, self.flush)
+
+        await future
+
+    async def _flush(self, batch: list[_Write]) -> None:
+        async with self._lock:
+            # Consecutive writes of the same kind run as one statement, So an
+            # insert followed by a delete of the same member keeps its order.
+            for insert, group in itertools.groupby(batch, key=lambda write: write[0]):
+                writes = list(group)
+                try:
+                    if insert:
+                        await self._insert(writes)
+                    else:
+                        await self._pool.execute(
+                            Query.REMOVE_MEMBERS, [ctx_id for _, ctx_id, _ in writes]
+                        )
+                        for *_, future in writes:
+                            _resolve(future)
+
+                except Exception as exc:
+                    for *_, future in writes:
+                        _resolve(future, exc)
+
+            _LOG.debug("Flushed %d membership writes.", len(batch))
+
+    async def _insert(self, writes: list[_Write]) -> None:
+        try:
+            rows = await self._pool.fetch(
+                Query.PUT_MEMBERS, *map(list, zip(*(record for _, record, _ in writes)))
+            )
+        except asyncpg.PostgresError:
+            if len(writes) == 1:
+                raise
+
+            # A single bad record shouldn't fail the whole batch.
+            for write in writes:
+                try:
+                    await self._insert([write])
+                except Exception as exc:
+                    _resolve(write[2], exc)
+            return
+
+        # The same member may be inserted more than once in a batch,
+        # Only the first insert is the one that went through.
+        inserted: dict[int, int] = {}
+        for row in rows:
+            inserted[row[0]] = inserted.get(row[0], 0) + 1
+
+        for _, record, future in writes:
+            ctx_id = record[0]
+            if inserted.get(ctx_id):
+                inserted[ctx_id] -= 1
+                _resolve(future)
+            else:
+                _resolve(future, ExistsError(f"User {ctx_id}:{record[2]} exists."))
+
+
+@typing.final
+class MembershipStream(iterators.LazyIterator[models.Membership]):
+    """A lazy iterator over memberships that are streamed from a cursor."""
+
+    __slots__: tuple[str, ...] = ("_records",)
+
+    def __init__(
+        self, records: collections.AsyncIterator[collections.Iterable[typing.Any]]
+    ) -> None:
+        self._records = records
+
+    async def __anext__(self) -> models.Membership:
+        try:
+            record = await anext(self._records)
+        except StopAsyncIteration:
+            self._complete()
+
+        return models.Membership.from_row(record)
 
 
 @typing.final
 class PgxPool(traits.PoolRunner):
     """Core database pool implementation."""
 
-    __slots__: tuple[str, ...] = ("_pool",)
+    __slots__: tuple[str, ...] = (
+        "_pool",
+        "_members",
+        "_writer",
+        "_fetching",
+        "_generation",
+        "_invalidated",
+        "_fresh_until",
+    )
+
+    def __init__(
+        self,
+        cfg: config.Config,
+        *,
+        setup: _Hook | None = None,
+        init: _Hook | None = None,
+    ) -> None:
+        self._pool = PartialPool(cfg, setup=setup, init=init)
+        self._writer: WriteBehind | None = None
+        if cfg.DB_WRITE_BATCH_SIZE > 0:
+            self._writer = WriteBehind(
+                self._pool,
+                max_size=cfg.DB_WRITE_BATCH_SIZE,
+                delay=cfg.DB_WRITE_BATCH_DELAY,
+            )
+        # ctx_id -> membership, `None` if the user is not synced.
+        self._members: (
+            cache.Expiring[snowflakes.Snowflake, models.Membership | None] | None
+        ) = None
+        # ctx_id -> [fetches in flight, invalidations since], So a fetch that raced
+        # with an invalidation doesn't cache the row it read before it.
+        self._fetching: dict[snowflakes.Snowflake, list[int]] = {}
+        # Bumped whenever the whole cache is invalidated.
+        self._generation = 0
+        # ctx_ids invalidated within the last `_FRESH_WINDOW` seconds.
+        self._invalidated: cache.Expiring[snowflakes.Snowflake, bool] | None = None
+        # Until when every membership is read from the primary.
+        self._fresh_until = 0.0
 
-    def __init__(self, cfg: config.Config) -> None:
-        self._pool = PartialPool(cfg)
+        if cfg.MEMBERSHIP_CACHE_SIZE > 0:
+            self._members = cache.Expiring(
+                cfg.MEMBERSHIP_CACHE_SIZE, cfg.MEMBERSHIP_CACHE_TTL
+            )
+            self._invalidated = cache.Expiring(cfg.MEMBERSHIP_CACHE_SIZE, _FRESH_WINDOW)
+            # Other processes may change the memberships we've cached.
+            self._pool.listen(_DESTINY_CHANNEL, self._on_destiny_change)
 
     def __repr__(self) -> str:
-        return f"<PgxPool(ref: {self._pool!r})>"
+        return f"<PgxPool(ref: {self._pool!r}, members: {self._members!r})>"
 
     @property
     def partial(self) -> traits.PartialPool:
         return self._pool
 
+    async def open(self) -> None:
+        await self._pool.open()
+
+    def _on_destiny_change(self, payload: str | None) -> None:
+        # Missed notifications.
+        if payload is None:
+            self._invalidate()
+            return
+
+        # <operation>:<ctx_id>:<origin>
+        operation, _, change = payload.partition(":")
+        ctx_id, _, origin = change.partition(":")
+        # This process' own writes already updated the cache.
+        if origin == _ORIGIN:
+            return
+
+        if operation == "TRUNCATE":
+            self._invalidate()
+            return
+
+        self._invalidate(hikari.Snowflake(ctx_id))
+
+    def _invalidate(self, user_id: snowflakes.Snowflake | None = None) -> None:
+        """Drop a cached membership, Or all of them if no user is given."""
+        if self._members is None or self._invalidated is None:
+            return
+
+        if user_id is None:
+            self._members.clear()
+            self._generation += 1
+            self._fresh_until = time.monotonic() + _FRESH_WINDOW
+            return
+
+        self._members.pop(user_id)
+        self._invalidated.put(user_id, True)
+        if (fetching := self._fetching.get(user_id)) is not None:
+            fetching[1] += 1
+
+    async def close(self) -> None:
+        # Pending writes must land before the connections are closed.
+        if self._writer is not None:
+            await self._writer.close()
+
+        await self._pool.close()
+
     async def fetch_destiny_member(
         self, user_id: snowflakes.Snowflake
     ) -> models.Membership:
-        query = await self._pool.fetchrow(
-            "SELECT * FROM Destiny WHERE ctx_id = $1;", user_id
+        if self._members is not None:
+            member = self._members.get(user_id, _MISSING)
+            if member is None:
+                raise ExistsError(f"User <@!{user_id}> not found.")
+
+            if member is not _MISSING:
+                return member
+
+        # A lagging replica would have the cache hold what was just invalidated.
+        fresh = time.monotonic() < self._fresh_until or (
+            self._invalidated is not None and self._invalidated.get(user_id, False)
+        )
+        generation = self._generation
+        fetching = self._fetching.setdefault(user_id, [0, 0])
+        fetching[0] += 1
+        invalidations = fetching[1]
+        try:
+            query = await self._pool.fetchrow(Query.FETCH_MEMBER, user_id, fresh=fresh)
+        finally:
+            fetching[0] -= 1
+            if not fetching[0]:
+                del self._fetching[user_id]
+
+        # The row may be stale if it was invalidated while being fetched.
+        members = (
+            self._members
+            if generation == self._generation and invalidations == fetching[1]
+            else None
         )
         if not query:
+            if members is not None:
+                members.put(user_id, None, ttl=_NEGATIVE_TTL)
             raise ExistsError(f"User <@!{user_id}> not found.")
 
-        return models.Membership.as_membership(dict(query))
+        member = models.Membership.from_row(query)
+        if members is not None:
+            members.put(user_id, member)
+
+        return member
 
     async def fetch_destiny_members(self) -> iterators.LazyIterator[models.Membership]:
-        query = await self._pool.fetch("SELECT * FROM Destiny;")
+        query = await self._pool.fetch(Query.FETCH_MEMBERS)
         if not query:
             raise ExistsError("No users found in Destiny tables.")
 
-        return iterators.FlatLazyIterator(
-            models.Membership.as_membership(dict(member)) for member in query
+        return iterators.FlatLazyIterator(models.Membership.from_rows(query))
+
+    def stream_destiny_members(
+        self, *, prefetch: int = 100
+    ) -> iterators.LazyIterator[models.Membership]:
+        return MembershipStream(
+            self._pool.cursor(Query.FETCH_MEMBERS, prefetch=prefetch)
         )
 
     async def put_destiny_member(
@@ -209,23 +1005,100 @@ class PgxPool(traits.PoolRunner):
         code: int,
         membership_type: aiobungie.MembershipType,
     ) -> None:
+        record = (int(user_id), membership_id, name, code, membership_type.name.title())
         try:
-            await self._pool.execute(
-                "INSERT INTO Destiny(ctx_id, membership_id, name, code, membership_type) "
-                "VALUES($1, $2, $3, $4, $5)",
-                int(user_id),
-                membership_id,
-                name,
-                code,
-                membership_type.name.title(),
-            )
-        except asyncpg.UniqueViolationError:
+            if self._writer is not None:
+                await self._writer.insert(record)
+            else:
+                await self._pool.execute(Query.PUT_MEMBER, *record)
+
+        except (asyncpg.UniqueViolationError, ExistsError):
+            # We don't know which row it conflicted with, Let the next read fetch it.
+            self._invalidate(user_id)
             raise ExistsError(f"User {user_id}:{name} exists.")
 
+        if self._members is not None:
+            # Fetches in flight read the row before it was written.
+            self._invalidate(user_id)
+            self._members.put(
+                user_id,
+                models.Membership(
+                    ctx_id=hikari.Snowflake(user_id),
+                    membership_id=membership_id,
+                    name=name,
+                    code=code,
+                    membership_type=membership_type.name.title(),
+                ),
+            )
+
+    async def export_destiny_members(
+        self,
+        path: pathlib.Path,
+        *,
+        format: typing.Literal["binary", "csv"] = "binary",
+    ) -> int:
+        """Stream the Destiny table into a file with `COPY`.
+
+        Returns the number of exported members.
+        """
+        async with self._pool.acquire("COPY Destiny TO") as conn:
+            status = await conn.copy_from_table(
+                "destiny",
+                output=path,
+                columns=_DESTINY_COLUMNS,
+                format=format,
+                header=True if format == "csv" else None,
+            )
+        # COPY <count>
+        return int(typing.cast(str, status).rsplit(" ", 1)[-1])
+
+    async def import_destiny_members(
+        self,
+        path: pathlib.Path,
+        *,
+        format: typing.Literal["binary", "csv"] = "binary",
+        truncate: bool = False,
+    ) -> int:
+        """Stream an exported file into the Destiny table with `COPY`.
+
+        The rows are copied into a temporary table first, So the members that
+        already exist are skipped instead of failing the whole import.
+        Returns the number of imported members.
+        """
+        async with self._pool.acquire("COPY Destiny FROM") as conn, conn.transaction():
+            await conn.execute(
+                "CREATE TEMPORARY TABLE destiny_import "
+                "(LIKE Destiny INCLUDING DEFAULTS) ON COMMIT DROP;"
+            )
+            await conn.copy_to_table(
+                "destiny_import",
+                source=path,
+                columns=_DESTINY_COLUMNS,
+                format=format,
+                header=True if format == "csv" else None,
+            )
+            if truncate:
+                await conn.execute("TRUNCATE Destiny;")
+
+            columns = ", ".join(_DESTINY_COLUMNS)
+            status = await conn.execute(
+                f"INSERT INTO Destiny({columns}) SELECT {columns} FROM destiny_import "
+                "ON CONFLICT DO NOTHING;"
+            )
+
+        self._invalidate()
+
+        # INSERT 0 <count>
+        return int(status.rsplit(" ", 1)[-1])
+
     async def remove_destiny_member(self, user_id: snowflakes.Snowflake) -> None:
         try:
-            await self._pool.execute(
-                "DELETE FROM Destiny WHERE ctx_id = $1", int(user_id)
-            )
+            if self._writer is not None:
+                await self._writer.delete(int(user_id))
+            else:
+                await self._pool.execute(Query.REMOVE_MEMBER, int(user_id))
+
         except asyncpg.NoDataFoundError:
             raise ExistsError
+        finally:
+            self._invalidate(user_id)
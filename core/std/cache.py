@@ -23,9 +23,10 @@
 
 from __future__ import annotations
 
-__all__: tuple[str, ...] = ("Memory", "Hash")
+__all__: tuple[str, ...] = ("Memory", "Hash", "Expiring")
 
 import asyncio
+import collections
 import datetime
 import logging
 import math
@@ -43,13 +44,14 @@ from core import models
 from . import boxed, config, traits
 
 if typing.TYPE_CHECKING:
-    import collections.abc as collections
+    import collections.abc as collections_abc
 
 
 _LOG: typing.Final[logging.Logger] = logging.getLogger("fated.cache")
 
 MKT = typing.TypeVar("MKT")
 MVT = typing.TypeVar("MVT")
+_T = typing.TypeVar("_T")
 
 
 @typing.final
@@ -197,7 +199,7 @@ class Memory(hikari_collections.FreezableDict[MKT, MVT]):
     """In-Memory cache."""
 
     if typing.TYPE_CHECKING:
-        _data: collections.MutableMapping[MKT, MVT]
+        _data: collections_abc.MutableMapping[MKT, MVT]
 
     def __init__(self) -> None:
         super().__init__()
@@ -216,3 +218,60 @@ class Memory(hikari_collections.FreezableDict[MKT, MVT]):
         return "\n".join(
             boxed.with_block(f"MemoryCache({k}={v!r})") for k, v in self._data.items()
         )
+
+
+@typing.final
+class Expiring(typing.Generic[MKT, MVT]):
+    """A bounded in-memory LRU cache which its entries expire after a TTL."""
+
+    __slots__: typing.Sequence[str] = ("_data", "_max_size", "_ttl")
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0) -> None:
+        # key -> (expires at, value), Ordered from the least to the most recently used.
+        self._data: collections.OrderedDict[MKT, tuple[float, MVT]] = (
+            collections.OrderedDict()
+        )
+        self._max_size = max_size
+        self._ttl = ttl
+
+    @typing.overload
+    def get(self, key: MKT) -> MVT | None:
+        ...
+
+    @typing.overload
+    def get(self, key: MKT, default: _T) -> MVT | _T:
+        ...
+
+    def get(self, key: MKT, default: typing.Any = None) -> typing.Any:
+        try:
+            expires_at, value = self._data[key]
+        except KeyError:
+            return default
+
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: MKT, value: MVT, *, ttl: float | None = None) -> None:
+        """Cache a value, `ttl` overrides the cache's default TTL for this entry."""
+        expires_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: MKT) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"Expiring(size={len(self._data)}/{self._max_size}, ttl={self._ttl})"
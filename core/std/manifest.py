@@ -0,0 +1,367 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""A local store of the Destiny manifest definitions."""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Manifest", "TABLES")
+
+import asyncio
+import concurrent.futures
+import logging
+import mmap
+import os
+import pathlib
+import sqlite3
+import typing
+
+import aiobungie
+import aiohttp
+from hikari.internal import data_binding
+
+from . import search
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+    from aiobungie import typedefs
+
+_LOG: typing.Final[logging.Logger] = logging.getLogger("fated.manifest")
+
+TABLES: typing.Final[tuple[str, ...]] = (
+    "DestinyActivityDefinition",
+    "DestinyCollectibleDefinition",
+    "DestinyInventoryItemDefinition",
+)
+"""The definition tables that are stored locally."""
+# Tables are hundreds of megabytes, So a download only fails when it stalls.
+_DOWNLOAD_TIMEOUT: typing.Final[aiohttp.ClientTimeout] = aiohttp.ClientTimeout(
+    total=None, sock_connect=30.0, sock_read=60.0
+)
+_CHUNK_SIZE: typing.Final[int] = 1 << 16
+
+
+def _decode_table(
+    raw: mmap.mmap,
+) -> collections.Generator[tuple[int, bytes], None, None]:
+    """Split a definition table into its hashes and their JSON definition."""
+    if msgspec is not None:
+        # Keeps each definition as raw JSON instead of decoding and encoding it again.
+        table = msgspec.json.decode(raw, type=dict[str, msgspec.Raw])
+        return ((int(hash_), bytes(entity)) for hash_, entity in table.items())
+
+    table = typing.cast("typedefs.JSONObject", data_binding.default_json_loads(raw[:]))
+    return (
+        (int(hash_), data_binding.default_json_dumps(entity))
+        for hash_, entity in table.items()
+    )
+
+
+@typing.final
+class Manifest:
+    """Destiny definitions downloaded once per game version into a SQLite file.
+
+    Lookups are served from the file on the event loop since they're a single
+    primary key read, Definitions that are not stored locally are fetched from REST.
+    A background task checks for a new version every `interval` seconds and only
+    downloads the tables which changed, `0` only checks once when opened.
+    Tables are streamed to disk through their own session, So a download doesn't
+    hold up the bot's other requests.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_client",
+        "_path",
+        "_language",
+        "_tables",
+        "_conn",
+        "_version",
+        "_paths",
+        "_interval",
+        "_lock",
+        "_task",
+        "_indexes",
+    )
+
+    def __init__(
+        self,
+        client: aiobungie.Client,
+        /,
+        *,
+        path: pathlib.Path | str = "manifest.db",
+        language: str = "en",
+        tables: collections.Sequence[str] = TABLES,
+        interval: float = 3600.0,
+    ) -> None:
+        self._client = client
+        self._path = pathlib.Path(path)
+        self._language = language
+        self._tables = frozenset(tables)
+        self._conn: sqlite3.Connection | None = None
+        self._version: str | None = None
+        # The content path of each stored table.
+        self._paths: dict[str, str] = {}
+        self._interval = interval
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._indexes: dict[str, search.Index] = {}
+
+    def __repr__(self) -> str:
+        return f"<Manifest(path: {str(self._path)!r}, version: {self._version!r})>"
+
+    @property
+    def version(self) -> str | None:
+        """The version of the stored definitions, `None` if nothing is stored yet."""
+        return self._version
+
+    async def open(self) -> None:
+        self._connect()
+        self._task = asyncio.create_task(self._keep_updated())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self) -> None:
+        if not self._path.exists():
+            return
+
+        self._conn = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True)
+        meta = dict(self._conn.execute("SELECT key, value FROM Meta;").fetchall())
+        self._version = meta.pop("version")
+        self._paths = {
+            key.removeprefix("path:"): path
+            for key, path in meta.items()
+            if key.startswith("path:")
+        }
+
+    async def _keep_updated(self) -> None:
+        if self._conn is not None:
+            await self._reindex()
+
+        while True:
+            try:
+                await self.update()
+            except Exception as exc:
+                _LOG.warning("Couldn't update the manifest, Using %s: %s", self, exc)
+
+            if not self._interval:
+                return
+
+            await asyncio.sleep(self._interval)
+
+    async def update(self, *, force: bool = False) -> bool:
+        """Download the definition tables that changed since the stored version.
+
+        The update is applied to a copy of the store which then replaces it,
+        Returns `True` if the stored definitions were replaced.
+        """
+        async with self._lock:
+            content = await self._client.rest.fetch_manifest_path()
+            version: str = content["version"]
+            components = content["jsonWorldComponentContentPaths"][self._language]
+            # A table's content path changes whenever its content does.
+            paths = {table: components[table] for table in self._tables}
+            changed = [
+                table
+                for table, path in paths.items()
+                if force or self._paths.get(table) != path
+            ]
+            stale = self._paths.keys() - paths.keys()
+            if version == self._version and not changed and not stale:
+                return False
+
+            _LOG.info(
+                "Updating manifest %s -> %s, Changed tables: %s",
+                self._version,
+                version,
+                ", ".join(changed) or "none",
+            )
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            tmp.unlink(missing_ok=True)
+
+            loop = asyncio.get_running_loop()
+            # The connection stays on this thread, So a cancelled update doesn't
+            # close it while a table is still being written.
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="fated-manifest"
+            )
+            conn = await loop.run_in_executor(
+                executor, self._copy, tmp, force or self._conn is None
+            )
+            download = self._path.with_name(self._path.name + ".download")
+            try:
+                async with aiohttp.ClientSession(timeout=_DOWNLOAD_TIMEOUT) as session:
+                    for table in changed:
+                        await self._download(
+                            session, aiobungie.url.BASE + paths[table], download
+                        )
+                        await loop.run_in_executor(
+                            executor, self._write_table, conn, table, download
+                        )
+
+                meta = [("version", version)]
+                meta.extend((f"path:{table}", path) for table, path in paths.items())
+                await loop.run_in_executor(
+                    executor, self._write_meta, conn, meta, stale
+                )
+            finally:
+                closed = executor.submit(conn.close)
+                executor.shutdown(wait=False)
+                download.unlink(missing_ok=True)
+
+            await asyncio.wrap_future(closed)
+            # Nothing is awaited while swapping, So lookups see either store as a whole.
+            if self._conn is not None:
+                self._conn.close()
+            os.replace(tmp, self._path)
+            self._connect()
+            await self._reindex()
+            _LOG.info("Manifest updated to version %s.", version)
+            return True
+
+    def _copy(self, tmp: pathlib.Path, fresh: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(tmp)
+        if fresh:
+            conn.execute(
+                "CREATE TABLE Meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            )
+            return conn
+
+        # Start from the current store so only the changed tables are written.
+        source = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True)
+        try:
+            source.backup(conn)
+        finally:
+            source.close()
+        return conn
+
+    @staticmethod
+    async def _download(
+        session: aiohttp.ClientSession, url: str, path: pathlib.Path
+    ) -> None:
+        async with session.get(url, raise_for_status=True) as response:
+            with path.open("wb") as file:
+                async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                    file.write(chunk)
+
+    @staticmethod
+    def _write_table(conn: sqlite3.Connection, table: str, path: pathlib.Path) -> None:
+        conn.execute(f"DROP TABLE IF EXISTS {table};")
+        conn.execute(
+            f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, json BLOB NOT NULL);"
+        )
+        # Mapped instead of read, So the table isn't copied into memory as well.
+        with path.open("rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as raw:
+            rows = _decode_table(raw)
+            try:
+                conn.executemany(f"INSERT INTO {table} VALUES (?, ?);", rows)
+            finally:
+                # Releases the decoded table's views of the mapping before it's closed.
+                rows.close()
+
+    @staticmethod
+    def _write_meta(
+        conn: sqlite3.Connection,
+        meta: collections.Iterable[tuple[str, str]],
+        stale: collections.Iterable[str],
+    ) -> None:
+        for table in stale:
+            conn.execute(f"DROP TABLE IF EXISTS {table};")
+            conn.execute("DELETE FROM Meta WHERE key = ?;", (f"path:{table}",))
+
+        conn.executemany("INSERT OR REPLACE INTO Meta VALUES (?, ?);", meta)
+        conn.commit()
+
+    async def _reindex(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._indexes = await loop.run_in_executor(
+            None, self._build_indexes, tuple(self._paths)
+        )
+        _LOG.debug("Indexed %s", self._indexes)
+
+    def _build_indexes(self, tables: tuple[str, ...]) -> dict[str, search.Index]:
+        conn = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True)
+        try:
+            return {
+                table: search.Index(
+                    (hash_, name, (words,) if words else ())
+                    for hash_, name, words in conn.execute(
+                        "SELECT id, json_extract(json, '$.displayProperties.name'), "
+                        f"json_extract(json, '$.itemTypeDisplayName') FROM {table};"
+                    )
+                    if name
+                )
+                for table in tables
+            }
+        finally:
+            conn.close()
+
+    def search(
+        self, definition: str, query: str, /, *, limit: int = 25
+    ) -> list[search.Match]:
+        """Search the names of this definition's stored entities.
+
+        Returns an empty list if the definition is not stored or not indexed yet.
+        """
+        if (index := self._indexes.get(definition)) is None:
+            return []
+
+        return index.search(query, limit=limit)
+
+    def get(self, definition: str, hash: int) -> typedefs.JSONObject | None:
+        """Returns a stored definition, `None` if it's not stored locally."""
+        if self._conn is None or definition not in self._paths:
+            return None
+
+        row = self._conn.execute(
+            f"SELECT json FROM {definition} WHERE id = ?;", (hash,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return typing.cast(
+            "typedefs.JSONObject", data_binding.default_json_loads(row[0])
+        )
+
+    async def fetch_entity(self, definition: str, hash: int) -> typedefs.JSONObject:
+        """Returns a definition from the local store, Or fetches it from REST."""
+        if (entity := self.get(definition, hash)) is not None:
+            return entity
+
+        _LOG.debug("%s:%s is not stored locally, Fetching.", definition, hash)
+        return await self._client.rest.fetch_entity(definition, hash)
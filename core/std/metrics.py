@@ -0,0 +1,114 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""In-process metrics primitives."""
+
+from __future__ import annotations
+
+__all__: tuple[str] = ("Histogram",)
+
+import bisect
+import math
+import typing
+
+
+@typing.final
+class Histogram:
+    """A fixed buckets histogram of durations in milliseconds.
+
+    Percentiles are interpolated linearly within the bucket they fall in,
+    Which keeps the memory constant no matter how many values are observed.
+    """
+
+    BUCKETS: typing.ClassVar[tuple[float, ...]] = (
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        25.0,
+        50.0,
+        100.0,
+        250.0,
+        500.0,
+        1_000.0,
+        2_500.0,
+        5_000.0,
+        10_000.0,
+        30_000.0,
+        math.inf,
+    )
+
+    __slots__: typing.Sequence[str] = ("_counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self._counts = [0] * len(self.BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        """Returns the approximated `p` percentile, Where `p` is between 0 and 1."""
+        if not self.count:
+            return 0.0
+
+        rank = max(p * self.count, 1.0)
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.BUCKETS, self._counts):
+            if count and seen + count >= rank:
+                # Nothing was observed above the max, So it caps the last bucket.
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+
+            seen += count
+            lower = bound
+
+        return self.max
+
+    @property
+    def p50(self) -> float:
+        return self.percentile(0.50)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(0.95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(0.99)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Histogram(count={self.count}, p50={self.p50:.1f}ms, "
+            f"p95={self.p95:.1f}ms, p99={self.p99:.1f}ms, max={self.max:.1f}ms)"
+        )
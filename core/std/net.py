@@ -25,60 +25,544 @@
 
 from __future__ import annotations
 
-__all__: tuple[str] = ("HTTPNet",)
+__all__: tuple[str, ...] = (
+    "HTTPNet",
+    "CircuitBreaker",
+    "CircuitState",
+    "CircuitOpenError",
+    "RouteMetrics",
+    "Request",
+    "Result",
+)
 
 import asyncio
-import contextlib
+import collections
 import datetime
+import enum
+import functools
 import http
+import itertools
 import logging
 import random
+import re
+import time
 import typing
+import urllib.parse
 
 import aiohttp
+import attrs
 import hikari
 from hikari import _about as about
 from hikari.internal import data_binding, net
 from yuyo import backoff
 
-from . import traits
+from . import metrics, traits
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 if typing.TYPE_CHECKING:
+    import collections.abc as collections_abc
     import types
 
 
+_T = typing.TypeVar("_T")
+
 _LOG: typing.Final[logging.Logger] = logging.getLogger("core.net")
+# Stop tracking new routes past this, i.e., Urls built from arbitrary user input.
+_MAX_TRACKED_ROUTES: typing.Final[int] = 256
+# The most hosts that keep a circuit breaker, The least recently used is forgotten.
+_MAX_TRACKED_HOSTS: typing.Final[int] = 256
+# Numbers, Hashes and UUIDs in paths.
+_ID_SEGMENT: typing.Final[re.Pattern[str]] = re.compile(
+    r"-?\d+|[0-9a-f]{16,}|[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}", re.IGNORECASE
+)
+_USER_AGENT: typing.Final[
+    str
+] = f"Fated DiscordBot(https://github.com/nxtlo/Fated) Hikari/{about.__version__}"
+
+
+class CircuitOpenError(RuntimeError):
+    """A runtime error raised when a request is refused by an open circuit."""
+
+    __slots__ = ("host", "retry_after")
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        super().__init__(host, retry_after)
+        self.host = host
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return f"Circuit for {self.host} is open, Retry after {self.retry_after:.1f}s."
+
+
+@typing.final
+class CircuitState(str, enum.Enum):
+    """The state of a host's circuit breaker."""
+
+    CLOSED = "closed"
+    """Requests are let through and their outcome is recorded."""
+    OPEN = "open"
+    """Requests fail immediately until the cooldown is over."""
+    HALF_OPEN = "half-open"
+    """A single probe request is let through to test the host."""
+
+    def __str__(self) -> str:
+        return self.value
+
+
+@typing.final
+class CircuitBreaker:
+    """A per-host circuit breaker.
+
+    The circuit stays closed while the error rate of the last `window` calls
+    is under `threshold`. Once crossed it opens and refuses all calls for `cooldown`
+    seconds, Then lets a single probe through which either closes or re-opens it.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "host",
+        "threshold",
+        "min_calls",
+        "cooldown",
+        "_state",
+        "_calls",
+        "_opened_at",
+        "_probing",
+        "_trips",
+    )
+
+    def __init__(
+        self,
+        host: str,
+        /,
+        *,
+        threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        cooldown: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.threshold = threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._state = CircuitState.CLOSED
+        # True for a failed call, False for a successful one.
+        self._calls: collections.deque[bool] = collections.deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._trips = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(self._calls) / len(self._calls)
+
+    @property
+    def trips(self) -> int:
+        """How many times this circuit has opened."""
+        return self._trips
+
+    def acquire(self) -> None:
+        """Check whether a call may go through, Raising `CircuitOpenError` if not."""
+        state = self.state
+
+        if state is CircuitState.CLOSED:
+            return
+
+        if state is CircuitState.HALF_OPEN and not self._probing:
+            self._state = CircuitState.HALF_OPEN
+            self._probing = True
+            return
+
+        retry_after = max(self.cooldown - (time.monotonic() - self._opened_at), 0.0)
+        raise CircuitOpenError(self.host, retry_after)
+
+    def release(self) -> None:
+        """Release an in-flight probe without recording its outcome."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self._probing = False
+        if self._state is CircuitState.HALF_OPEN:
+            _LOG.info("Circuit for %s closed.", self.host)
+            self.reset()
+            return
+
+        self._calls.append(False)
+
+    def record_failure(self) -> None:
+        self._probing = False
+        if self._state is CircuitState.HALF_OPEN:
+            self._trip()
+            return
+
+        self._calls.append(True)
+        if (
+            self._state is CircuitState.CLOSED
+            and len(self._calls) >= self.min_calls
+            and self.error_rate >= self.threshold
+        ):
+            self._trip()
+
+    def reset(self) -> None:
+        """Force the circuit back to the closed state."""
+        self._state = CircuitState.CLOSED
+        self._calls.clear()
+        self._probing = False
+
+    def _trip(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self._trips += 1
+        _LOG.warning(
+            "Circuit for %s opened, Failing fast for %.1fs.", self.host, self.cooldown
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CircuitBreaker(host={self.host}, state={self.state}, "
+            f"error_rate={self.error_rate:.0%}, trips={self._trips})"
+        )
+
+
+_Body: typing.TypeAlias = (
+    "data_binding.JSONObject | data_binding.JSONArray | bytes | None"
+)
+
+
+def _get(body: _Body, getter: str | None, url: str) -> typing.Any:
+    if getter is None or body is None or isinstance(body, bytes):
+        return body
+
+    # Arrays have no keys to look up.
+    if isinstance(body, dict) and getter in body:
+        return body[getter]
+
+    raise LookupError(f"Key {getter} not found in {body!r} {url}")
+
+
+@functools.cache
+def _typed_decoder(schema: type[_T]) -> collections_abc.Callable[[bytes], _T]:
+    if msgspec is not None:
+        # Validates and builds the instance in one pass without an intermediate dict.
+        decoder = msgspec.json.Decoder(schema)
+        # Bound here since the module can't be narrowed inside the closure.
+        validation_error = msgspec.ValidationError
+
+        def decode(raw: bytes) -> _T:
+            try:
+                return decoder.decode(raw)
+            except validation_error as exc:
+                raise LookupError(f"Couldn't decode {schema.__name__}: {exc}") from exc
+
+        return decode
+
+    names = tuple(field.name for field in attrs.fields(schema))
+
+    def decode_fallback(raw: bytes) -> _T:
+        data = data_binding.default_json_loads(raw)
+        try:
+            return schema(**{name: data[name] for name in names})
+        except (KeyError, TypeError) as exc:
+            raise LookupError(
+                f"Couldn't decode {schema.__name__} from {data!r}"
+            ) from exc
+
+    return decode_fallback
+
+
+@functools.cache
+def _getter_decoder(getter: str) -> collections_abc.Callable[[bytes], typing.Any]:
+    assert msgspec is not None
+    # Only the one key gets decoded, The rest of the document is skipped.
+    struct = msgspec.defstruct(
+        "Getter", [("value", typing.Any)], rename={"value": getter}
+    )
+    decoder = msgspec.json.Decoder(struct)
+    validation_error = msgspec.ValidationError
+
+    def decode(raw: bytes) -> typing.Any:
+        try:
+            # The field is defined at runtime so it's not known to the type checker.
+            return getattr(decoder.decode(raw), "value")
+        except validation_error as exc:
+            raise LookupError(f"Key {getter} not found: {exc}") from exc
+
+    return decode
+
+
+def _decoder_of(
+    schema: type[typing.Any] | None, getter: str | None
+) -> tuple[collections_abc.Hashable, collections_abc.Callable[[bytes], typing.Any]]:
+    """Returns a key for the decoder used on a response body and the decoder itself.
+
+    A `None` key is the generic decoder, In that case the getter should be looked up
+    on the decoded body.
+    """
+    if schema is not None:
+        if getter is not None:
+            raise ValueError("Only one of getter or schema can be passed.")
+        return schema, _typed_decoder(schema)
+
+    if getter is not None and msgspec is not None:
+        return getter, _getter_decoder(getter)
+
+    return None, data_binding.default_json_loads
+
+
+@attrs.define(weakref_slot=False)
+class RouteMetrics:
+    """HTTP metrics recorded for a single host and route template."""
+
+    latency: metrics.Histogram = attrs.field(factory=metrics.Histogram)
+    """How long the upstream took to respond, Excluding the pool wait."""
+    pool_wait: metrics.Histogram = attrs.field(factory=metrics.Histogram)
+    """How long the request waited for the client lock and a pooled connection."""
+    statuses: collections.Counter[int] = attrs.field(factory=collections.Counter)
+    retries: int = 0
+    errors: int = 0
+    """Requests that failed before getting a response, i.e., Connection errors."""
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+
+@attrs.frozen(weakref_slot=False)
+class Request:
+    """A single request to send with `HTTPNet.request_many`."""
+
+    url: str
+    method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"] = "GET"
+    getter: str | None = attrs.field(default=None, kw_only=True)
+    json: data_binding.JSONObjectBuilder | None = attrs.field(
+        default=None, kw_only=True
+    )
+    unwrap_bytes: bool = attrs.field(default=False, kw_only=True)
+    schema: type[typing.Any] | None = attrs.field(default=None, kw_only=True)
+
+
+@attrs.frozen(weakref_slot=False)
+class Result:
+    """The outcome of a request sent with `HTTPNet.request_many`."""
+
+    index: int
+    """The position of the request in the input."""
+    request: Request
+    value: typing.Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> typing.Any:
+        """Returns the value, Raising the error if the request failed."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _route_of(url: str) -> tuple[str, str]:
+    # Ids in paths are collapsed and the query is dropped so routes group together.
+    parts = urllib.parse.urlsplit(url)
+    route = "/".join(
+        "{id}" if _ID_SEGMENT.fullmatch(segment) else segment
+        for segment in parts.path.split("/")
+        if segment
+    )
+    return parts.netloc.lower(), "/" + route
+
+
+class _Trace:
+    __slots__ = ("queued_at", "wait")
+
+    def __init__(self) -> None:
+        self.queued_at = 0.0
+        self.wait = 0.0
+
+
+async def _on_queued_start(
+    _: aiohttp.ClientSession,
+    ctx: types.SimpleNamespace,
+    __: aiohttp.TraceConnectionQueuedStartParams,
+) -> None:
+    if isinstance(trace := ctx.trace_request_ctx, _Trace):
+        trace.queued_at = time.perf_counter()
+
+
+async def _on_queued_end(
+    _: aiohttp.ClientSession,
+    ctx: types.SimpleNamespace,
+    __: aiohttp.TraceConnectionQueuedEndParams,
+) -> None:
+    if isinstance(trace := ctx.trace_request_ctx, _Trace):
+        trace.wait += time.perf_counter() - trace.queued_at
+
+
+def _response_error(response: aiohttp.ClientResponse) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(
+        response.request_info,
+        response.history,
+        status=response.status,
+        message=response.reason or "",
+        headers=response.headers,
+    )
 
 
 @typing.final
 class HTTPNet(traits.NetRunner):
     """A client to make HTTP requests with."""
 
-    __slots__: typing.Sequence[str] = ("_session", "_lock")
-
-    def __init__(self, lock: asyncio.Lock | None = None) -> None:
+    __slots__: typing.Sequence[str] = (
+        "_session",
+        "_lock",
+        "_max_retries",
+        "_circuits",
+        "_circuit_threshold",
+        "_circuit_cooldown",
+        "_inflight",
+        "_refs",
+        "_metrics",
+        "_dns_ttl",
+        "_warm_hosts",
+    )
+
+    def __init__(
+        self,
+        lock: asyncio.Lock | None = None,
+        *,
+        max_retries: int = 4,
+        circuit_threshold: float = 0.5,
+        circuit_cooldown: float = 30.0,
+        dns_ttl: int | None = 10,
+        warm_hosts: collections_abc.Sequence[str] = (),
+    ) -> None:
         self._session: aiohttp.ClientSession | None = None
         self._lock = lock
+        self._max_retries = max_retries
+        # Ordered from the least to the most recently used host.
+        self._circuits: collections.OrderedDict[str, CircuitBreaker] = (
+            collections.OrderedDict()
+        )
+        self._circuit_threshold = circuit_threshold
+        self._circuit_cooldown = circuit_cooldown
+        # Identical GET requests that're currently in flight, Shared as raw bodies.
+        self._inflight: dict[tuple[str, str, bool], asyncio.Task[bytes | None]] = {}
+        # How many `async with` blocks are using the session.
+        self._refs = 0
+        self._metrics: dict[tuple[str, str], RouteMetrics] = {}
+        # `None` doesn't cache the resolved hosts.
+        self._dns_ttl = dns_ttl
+        self._warm_hosts = warm_hosts
+
+    async def open(self) -> None:
+        """Keep the session open until `close` is called and warm up the hosts."""
+        await self.__aenter__()
+        await self.warm(self._warm_hosts)
 
     async def close(self) -> None:
         if self._session is None:
             raise RuntimeError("Cannot close a session that's already running.")
         await self._session.close()
         self._session = None
+        self._refs = 0
+
+    async def warm(self, hosts: collections_abc.Iterable[str]) -> None:
+        """Resolve and open a keep-alive connection to each of these hosts."""
+        await asyncio.gather(*(self._warm(host) for host in hosts))
+
+    async def _warm(self, host: str) -> None:
+        assert self._session is not None
+        started = time.perf_counter()
+        try:
+            async with self._session.head(
+                host, headers={"User-Agent": _USER_AGENT}, allow_redirects=False
+            ):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            _LOG.warning("Couldn't warm up a connection to %s: %s", host, exc)
+            return
+
+        _LOG.debug(
+            "Warmed up %s in %.2fms", host, (time.perf_counter() - started) * 1_000
+        )
 
     async def _create_session(self):
         if self._session is not None:
             raise RuntimeError("Session is already running...")
 
         http_settings = hikari.impl.HTTPSettings()
-        connector = net.create_tcp_connector(http_settings)
-        self._session = net.create_client_session(
-            connector,
-            connector_owner=False,
-            http_settings=http_settings,
+        connector = net.create_tcp_connector(
+            http_settings, dns_cache=False if self._dns_ttl is None else self._dns_ttl
+        )
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_queued_start.append(_on_queued_start)
+        trace.on_connection_queued_end.append(_on_queued_end)
+
+        # Same as `net.create_client_session` but that doesn't accept trace configs.
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            connector_owner=True,
             raise_for_status=False,
+            timeout=aiohttp.ClientTimeout(
+                connect=http_settings.timeouts.acquire_and_connect,
+                sock_connect=http_settings.timeouts.request_socket_connect,
+                sock_read=http_settings.timeouts.request_socket_read,
+                total=http_settings.timeouts.total,
+            ),
             trust_env=False,
+            version=aiohttp.HttpVersion11,
+            trace_configs=[trace],
+        )
+
+    def circuits(self) -> collections_abc.Mapping[str, CircuitBreaker]:
+        return self._circuits.copy()
+
+    def metrics(self) -> collections_abc.Mapping[tuple[str, str], RouteMetrics]:
+        return self._metrics.copy()
+
+    def _get_circuit(self, host: str) -> CircuitBreaker:
+        if (circuit := self._circuits.get(host)) is not None:
+            self._circuits.move_to_end(host)
+            return circuit
+
+        if len(self._circuits) >= _MAX_TRACKED_HOSTS:
+            # Forgetting an open circuit would let requests through to a failing host.
+            for stale, old in self._circuits.items():
+                if old.state is CircuitState.CLOSED:
+                    del self._circuits[stale]
+                    break
+            else:
+                self._circuits.popitem(last=False)
+
+        circuit = self._circuits[host] = CircuitBreaker(
+            host,
+            threshold=self._circuit_threshold,
+            cooldown=self._circuit_cooldown,
         )
+        return circuit
+
+    def _get_metrics(self, host: str, route: str) -> RouteMetrics:
+        if (stats := self._metrics.get((host, route))) is None:
+            key = (host, route)
+            if len(self._metrics) >= _MAX_TRACKED_ROUTES:
+                key = ("<untracked>", "<untracked>")
+            stats = self._metrics.setdefault(key, RouteMetrics())
+        return stats
 
     @typing.overload
     async def request(
@@ -92,6 +576,18 @@ class HTTPNet(traits.NetRunner):
     ) -> bytes | None:
         ...
 
+    @typing.overload
+    async def request(
+        self,
+        method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        url: str,
+        getter: None = None,
+        json: data_binding.JSONObjectBuilder | None = None,
+        *,
+        schema: type[_T],
+    ) -> _T:
+        ...
+
     @typing.overload
     async def request(
         self,
@@ -110,95 +606,258 @@ class HTTPNet(traits.NetRunner):
         json: data_binding.JSONObjectBuilder | None = None,
         *,
         unwrap_bytes: bool = False,
-    ) -> data_binding.JSONObject | data_binding.JSONArray | bytes | None:
-        if not self._lock:
-            self._lock = asyncio.Lock()
-
-        async with self._lock:
-            return await self._request(
-                method=method,
-                url=url,
-                getter=getter,
-                unwrap_bytes=unwrap_bytes,
-                json=json,
+        schema: type[typing.Any] | None = None,
+    ) -> typing.Any:
+        return await self._dispatch(
+            method, url, getter, json, unwrap_bytes=unwrap_bytes, schema=schema
+        )
+
+    async def request_many(
+        self,
+        requests: collections_abc.Iterable[Request],
+        /,
+        *,
+        concurrency: int = 8,
+        ordered: bool = False,
+    ) -> collections_abc.AsyncIterator[Result]:
+        """Send many requests with at most `concurrency` of them in flight.
+
+        Results are yielded as they complete, Or in the input order if `ordered`
+        is `True`. A failing request doesn't stop the others, Its error is set on
+        its result instead.
+        """
+        items = enumerate(requests)
+        pending: set[asyncio.Task[Result]] = set()
+        # Completed results waiting for the ones before them when ordered.
+        buffered: dict[int, Result] = {}
+        next_index = 0
+
+        def spawn(n: int) -> None:
+            for index, request in itertools.islice(items, n):
+                pending.add(asyncio.create_task(self._run_one(index, request)))
+
+        spawn(concurrency)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                pending.difference_update(done)
+
+                for task in done:
+                    result = task.result()
+                    if ordered:
+                        buffered[result.index] = result
+                    else:
+                        yield result
+
+                while next_index in buffered:
+                    yield buffered.pop(next_index)
+                    next_index += 1
+
+                # Don't let a slow head request buffer up the whole input.
+                if len(buffered) < concurrency * 4:
+                    spawn(concurrency - len(pending))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _run_one(self, index: int, request: Request) -> Result:
+        try:
+            value = await self._dispatch(
+                request.method,
+                request.url,
+                request.getter,
+                request.json,
+                unwrap_bytes=request.unwrap_bytes,
+                schema=request.schema,
+                serialize=False,
             )
+        except Exception as exc:
+            return Result(index, request, error=exc)
+        return Result(index, request, value)
 
-    async def _request(
+    async def _dispatch(
         self,
         method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
         url: str,
         getter: str | None = None,
         json: data_binding.JSONObjectBuilder | None = None,
         *,
-        unwrap_bytes: bool | None = False,
-    ) -> data_binding.JSONObject | data_binding.JSONArray | bytes | None:
-        assert self._session is not None
-        data: data_binding.JSONObject | data_binding.JSONArray | bytes | None = None
-        backoff_ = backoff.Backoff(max_retries=4)
+        unwrap_bytes: bool = False,
+        schema: type[typing.Any] | None = None,
+        serialize: bool = True,
+    ) -> typing.Any:
+        decoding, decode = _decoder_of(schema, getter)
+        # The generic decoder returns the whole body so the getter is looked up after.
+        lookup = getter if decoding is None else None
+
+        # Only idempotent requests are shared between the waiters.
+        if method != "GET" or json is not None:
+            raw = await self._send(
+                method, url, json, unwrap_bytes=unwrap_bytes, serialize=serialize
+            )
+        else:
+            # Each waiter decodes the shared body itself, So waiters with a different
+            # getter or schema still share the same request.
+            key = (method, url, unwrap_bytes)
+            if (task := self._inflight.get(key)) is None:
+                task = self._inflight[key] = asyncio.create_task(
+                    self._send(
+                        method, url, unwrap_bytes=unwrap_bytes, serialize=serialize
+                    )
+                )
+                task.add_done_callback(lambda t: self._forget(key, t))
 
-        user_agent: typing.Final[
-            str
-        ] = f"Fated DiscordBot(https://github.com/nxtlo/Fated) Hikari/{about.__version__}"
+            # Shielded so a cancelled waiter doesn't cancel the request for the others.
+            raw = await asyncio.shield(task)
 
-        headers = {}
-        headers["User-Agent"] = user_agent
+        if raw is None or unwrap_bytes:
+            return raw
+        return _get(decode(raw), lookup, url)
 
-        stack = contextlib.AsyncExitStack()
+    def _forget(
+        self, key: tuple[str, str, bool], task: asyncio.Task[bytes | None]
+    ) -> None:
+        self._inflight.pop(key, None)
+        # Mark the exception as retrieved in case all the waiters are gone.
+        if not task.cancelled():
+            task.exception()
 
-        while True:
-            async for _ in backoff_:
-                try:
-                    response = await stack.enter_async_context(
-                        self._session.request(method, url, json=json, headers=headers)
-                    )
+    async def _send(
+        self,
+        method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        url: str,
+        json: data_binding.JSONObjectBuilder | None = None,
+        *,
+        unwrap_bytes: bool = False,
+        serialize: bool = True,
+    ) -> bytes | None:
+        if not serialize:
+            # Bulk requests bound their own concurrency, Only the pool is shared.
+            raw = await self._request(
+                method=method, url=url, unwrap_bytes=unwrap_bytes, json=json
+            )
+        else:
+            if not self._lock:
+                self._lock = asyncio.Lock()
+
+            started = time.perf_counter()
+            async with self._lock:
+                raw = await self._request(
+                    method=method,
+                    url=url,
+                    unwrap_bytes=unwrap_bytes,
+                    json=json,
+                    waited=time.perf_counter() - started,
+                )
+
+        # Decoded by the caller, Outside of the lock.
+        return raw
 
-                    if (
-                        http.HTTPStatus.MULTIPLE_CHOICES
-                        > response.status
-                        >= http.HTTPStatus.OK
-                    ):
-                        if not data:
-                            return None
-
-                        if unwrap_bytes:
-                            return await response.read()
-
-                        if response.content_type == "application/json":
-                            data = data_binding.default_json_loads(
-                                await response.read()
-                            )
-                            _LOG.debug(
-                                "%s Success from %s\n%s",
-                                method,
-                                response.real_url.human_repr(),
-                            )
-
-                            if getter:
-                                try:
-                                    return data[getter]  # type: ignore
-                                except KeyError:
-                                    raise LookupError(
-                                        f"Key {getter} not found in {data!r}"
-                                        f"{response.real_url!s}",
-                                    )
-
-                            return data
+    async def _request(
+        self,
+        method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        url: str,
+        json: data_binding.JSONObjectBuilder | None = None,
+        *,
+        unwrap_bytes: bool = False,
+        waited: float = 0.0,
+    ) -> bytes | None:
+        assert self._session is not None
+        host, route = _route_of(url)
+        stats = self._get_metrics(host, route)
+
+        circuit = self._get_circuit(host)
+        backoff_ = backoff.Backoff(max_retries=self._max_retries)
+        headers = {"User-Agent": _USER_AGENT}
+        error: BaseException | None = None
+
+        # Serialized once here instead of on every retry.
+        payload: bytes | None = None
+        if json is not None:
+            payload = data_binding.default_json_dumps(json)
+            headers["Content-Type"] = "application/json"
+
+        async for attempt in backoff_:
+            if attempt:
+                stats.retries += 1
+
+            # Fail fast if the host is down instead of waiting through the retries.
+            circuit.acquire()
+            trace = _Trace()
+            started = time.perf_counter()
+            try:
+                async with self._session.request(
+                    method, url, data=payload, headers=headers, trace_request_ctx=trace
+                ) as response:
+                    stats.statuses[response.status] += 1
 
                     # Handle the ratelimiting.
                     if response.status == http.HTTPStatus.TOO_MANY_REQUESTS:
+                        circuit.record_success()
                         _LOG.warning(
                             f"We're being ratelimited {response.headers}, {method}::{response.url.human_repr()}"
                         )
                         backoff_.set_next_backoff(random.random() / 2)
+                        stats.bytes_in += response.content_length or 0
+                        error = _response_error(response)
+                        continue
+
+                    if response.status >= http.HTTPStatus.INTERNAL_SERVER_ERROR:
+                        circuit.record_failure()
+                        stats.bytes_in += response.content_length or 0
+                        error = _response_error(response)
+                        continue
 
+                    circuit.record_success()
                     response.raise_for_status()
 
-                except (aiohttp.ContentTypeError, aiohttp.ClientPayloadError):
-                    raise
+                    raw = await response.read()
+                    stats.bytes_in += len(raw)
+                    _LOG.debug(
+                        "%s %s -> %s in %.2fms",
+                        method,
+                        response.real_url.human_repr(),
+                        response.status,
+                        (time.perf_counter() - started) * 1_000,
+                    )
+
+                    if not unwrap_bytes and response.content_type != "application/json":
+                        return None
+
+                    return raw
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+                circuit.record_failure()
+                stats.errors += 1
+                error = exc
+
+            finally:
+                # A probe that ended without recording an outcome, i.e., it was
+                # cancelled or failed with an unexpected error, Must not hold the
+                # half-open circuit forever.
+                circuit.release()
+                stats.latency.observe(
+                    (time.perf_counter() - started - trace.wait) * 1_000
+                )
+                stats.pool_wait.observe((waited + trace.wait) * 1_000)
+                stats.bytes_out += len(payload) if payload else 0
+                # The lock is only waited on before the first attempt.
+                waited = 0.0
+
+        assert error is not None
+        raise error
 
     async def __aenter__(self):
-        await self._create_session()
-        _LOG.debug("Acquired client session %s", datetime.datetime.now().astimezone())
+        # The session is shared between all the concurrent users of this client.
+        if self._session is None:
+            await self._create_session()
+            _LOG.debug(
+                "Acquired client session %s", datetime.datetime.now().astimezone()
+            )
+
+        self._refs += 1
         return self
 
     async def __aexit__(
@@ -207,8 +866,10 @@ class HTTPNet(traits.NetRunner):
         __: BaseException | None,
         ___: types.TracebackType | None,
     ) -> None:
-        await self.close()
-        _LOG.debug("Closed client session %s", datetime.datetime.now().astimezone())
+        self._refs -= 1
+        if self._refs == 0 and self._session is not None:
+            await self.close()
+            _LOG.debug("Closed client session %s", datetime.datetime.now().astimezone())
 
     def __repr__(self) -> str:
         return f"HTTPNet(session: {self._session!r})"
@@ -0,0 +1,154 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Background prefetching for endpoints that return a random response every call."""
+
+from __future__ import annotations
+
+__all__: tuple[str] = ("Prefetcher",)
+
+import asyncio
+import logging
+import typing
+
+from . import net, traits
+
+_LOG: typing.Final[logging.Logger] = logging.getLogger("fated.prefetch")
+_T = typing.TypeVar("_T")
+# The url, getter and schema of an endpoint.
+_Key: typing.TypeAlias = "tuple[str, str | None, type[typing.Any] | None]"
+
+
+@typing.final
+class Prefetcher:
+    """Keeps a small queue of ready responses for each registered endpoint.
+
+    Endpoints are registered the first time they're requested, After that a
+    background task keeps their queue filled. Refills don't take the client's lock
+    so they never hold up the commands' requests, They're limited by a semaphore
+    shared between all the endpoints instead.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_net",
+        "_size",
+        "_semaphore",
+        "_queues",
+        "_tasks",
+        "_closed",
+    )
+
+    def __init__(
+        self, net_: traits.NetRunner, /, *, size: int = 5, concurrency: int = 2
+    ) -> None:
+        self._net = net_
+        self._size = size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._queues: dict[_Key, asyncio.Queue[typing.Any]] = {}
+        self._tasks: dict[_Key, asyncio.Task[None]] = {}
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"<Prefetcher(endpoints: {len(self._queues)}, closed: {self._closed})>"
+
+    async def open(self) -> None:
+        self._closed = False
+
+    async def close(self) -> None:
+        self._closed = True
+        tasks = tuple(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queues.clear()
+
+    @typing.overload
+    async def get(self, url: str, *, schema: type[_T]) -> _T:
+        ...
+
+    @typing.overload
+    async def get(self, url: str, getter: str | None = None) -> typing.Any:
+        ...
+
+    async def get(
+        self,
+        url: str,
+        getter: str | None = None,
+        *,
+        schema: type[typing.Any] | None = None,
+    ) -> typing.Any:
+        """Returns a prefetched `GET` response from this url.
+
+        Falls back to requesting the url directly when the queue is empty.
+        """
+        key = (url, getter, schema)
+        if (queue := self._queues.get(key)) is None:
+            queue = self._register(key)
+
+        try:
+            return queue.get_nowait()
+        except asyncio.QueueEmpty:
+            _LOG.debug("Prefetch queue for %s is empty, Fetching.", url)
+            return await self._fetch(key)
+
+    def _register(self, key: _Key) -> asyncio.Queue[typing.Any]:
+        queue = self._queues[key] = asyncio.Queue[typing.Any](maxsize=self._size)
+        if not self._closed:
+            self._tasks[key] = asyncio.create_task(self._refill(key, queue))
+        return queue
+
+    async def _fetch(self, key: _Key) -> typing.Any:
+        url, getter, schema = key
+        async with self._net as client:
+            if schema is not None:
+                return await client.request("GET", url, schema=schema)
+            return await client.request("GET", url, getter=getter)
+
+    async def _prefetch(self, key: _Key) -> typing.Any:
+        url, getter, schema = key
+        async with self._net as client:
+            results = [
+                result
+                async for result in client.request_many(
+                    (net.Request(url, getter=getter, schema=schema),), concurrency=1
+                )
+            ]
+
+        return results[0].unwrap()
+
+    async def _refill(self, key: _Key, queue: asyncio.Queue[typing.Any]) -> None:
+        url = key[0]
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await self._prefetch(key)
+            except net.CircuitOpenError as exc:
+                await asyncio.sleep(exc.retry_after)
+            except Exception as exc:
+                _LOG.warning("Failed to prefetch %s: %s", url, exc)
+                await asyncio.sleep(5.0)
+            else:
+                # Blocks while the queue is full until a command takes an item.
+                await queue.put(response)
@@ -0,0 +1,168 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""In-memory prefix and trigram search over names."""
+
+from __future__ import annotations
+
+__all__: tuple[str, ...] = ("Index", "Match")
+
+import array
+import bisect
+import re
+import typing
+
+import attrs
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+_WORDS: typing.Final[re.Pattern[str]] = re.compile(r"[^\w]+")
+# The most keys a prefix scan looks at, Short prefixes can match thousands.
+_MAX_PREFIX_SCAN: typing.Final[int] = 500
+# The least share of the query's trigrams a fuzzy match must have.
+_MIN_SIMILARITY: typing.Final[float] = 0.6
+
+
+def _normalize(text: str) -> str:
+    return _WORDS.sub(" ", text.casefold()).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    # Padded so the start of each word counts as well.
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@attrs.frozen(weakref_slot=False)
+class Match:
+    """A search result."""
+
+    hash: int
+    name: str
+
+
+@typing.final
+class Index:
+    """A search index over names and their suggested words.
+
+    Prefixes are looked up with a binary search over the sorted keys, Which are every
+    name and every word in it, And queries that don't match a prefix fall back to
+    the names that share the most trigrams with it, Which tolerates typos.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        "_hashes",
+        "_names",
+        "_normalized",
+        "_keys",
+        "_owners",
+        "_trigrams",
+    )
+
+    def __init__(
+        self, entries: collections.Iterable[tuple[int, str, collections.Iterable[str]]]
+    ) -> None:
+        self._hashes = array.array("Q")
+        self._names: list[str] = []
+        self._normalized: list[str] = []
+        keys: list[tuple[str, int]] = []
+        trigrams: dict[str, array.array[int]] = {}
+
+        for hash_, name, words in entries:
+            if not (normalized := _normalize(name)):
+                continue
+
+            owner = len(self._names)
+            self._hashes.append(hash_)
+            self._names.append(name)
+            self._normalized.append(normalized)
+
+            tokens = {normalized, *normalized.split()}
+            for word in words:
+                tokens.update(_normalize(word).split())
+            keys.extend((token, owner) for token in tokens)
+
+            for trigram in _trigrams(normalized):
+                if (postings := trigrams.get(trigram)) is None:
+                    postings = trigrams[trigram] = array.array("I")
+                postings.append(owner)
+
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._owners = array.array("I", (owner for _, owner in keys))
+        self._trigrams = trigrams
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"<Index(names: {len(self._names)}, keys: {len(self._keys)})>"
+
+    def search(self, query: str, /, *, limit: int = 25) -> list[Match]:
+        """Returns the best matches for this query, Names are not repeated."""
+        if not (query := _normalize(query)):
+            return []
+
+        scores: dict[int, float] = {}
+        start = bisect.bisect_left(self._keys, query)
+        end = min(
+            bisect.bisect_left(self._keys, query + "\uffff", lo=start),
+            start + _MAX_PREFIX_SCAN,
+        )
+        for owner in self._owners[start:end]:
+            name = self._normalized[owner]
+            score = 3.0 if name == query else 2.0 if name.startswith(query) else 1.0
+            scores[owner] = max(scores.get(owner, 0.0), score)
+
+        if len(scores) < limit:
+            self._fuzzy(query, scores)
+
+        ranked = sorted(
+            scores, key=lambda owner: (-scores[owner], len(self._names[owner]), owner)
+        )
+        seen: set[str] = set()
+        matches: list[Match] = []
+        for owner in ranked:
+            if (name := self._names[owner]) in seen:
+                continue
+
+            seen.add(name)
+            matches.append(Match(self._hashes[owner], name))
+            if len(matches) >= limit:
+                break
+
+        return matches
+
+    def _fuzzy(self, query: str, scores: dict[int, float]) -> None:
+        trigrams = _trigrams(query)
+        shared: dict[int, int] = {}
+        for trigram in trigrams:
+            for owner in self._trigrams.get(trigram, ()):
+                shared[owner] = shared.get(owner, 0) + 1
+
+        for owner, count in shared.items():
+            # Below the prefix matches, Which are always scored 1 or more.
+            similarity = count / len(trigrams)
+            if similarity >= _MIN_SIMILARITY and owner not in scores:
+                scores[owner] = similarity * 0.99
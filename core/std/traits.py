@@ -47,6 +47,10 @@ if typing.TYPE_CHECKING:
     from hikari.internal import data_binding
 
     from core import models
+    from core.psql import pool
+    from core.std import net
+
+    _T = typing.TypeVar("_T")
 
 
 @typing.runtime_checkable
@@ -105,6 +109,7 @@ class PartialPool(fast.FastProtocolChecking, typing.Protocol):
         /,
         *args: typing.Any,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> list[typing.Any]:
         raise NotImplementedError
 
@@ -114,6 +119,7 @@ class PartialPool(fast.FastProtocolChecking, typing.Protocol):
         /,
         *args: typing.Any,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> list[typing.Any] | collections.Mapping[str, typing.Any] | tuple[typing.Any]:
         raise NotImplementedError
 
@@ -124,9 +130,49 @@ class PartialPool(fast.FastProtocolChecking, typing.Protocol):
         *args: typing.Any,
         column: int | None = 0,
         timeout: float | None = None,
+        fresh: bool = False,
     ) -> typing.Any:
         raise NotImplementedError
 
+    def listen(
+        self, channel: str, callback: collections.Callable[[str | None], None], /
+    ) -> None:
+        """Call `callback` with the payload of every notification sent to this channel."""
+        raise NotImplementedError
+
+    def metrics(self) -> collections.Mapping[str, pool.QueryMetrics]:
+        """Returns a snapshot of the recorded metrics keyed by the normalized query."""
+        raise NotImplementedError
+
+    def stats(self) -> collections.Mapping[str, pool.PoolStats]:
+        """Returns the saturation of the primary pool and each replica pool."""
+        raise NotImplementedError
+
+    async def explain(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        analyze: bool = False,
+        timeout: float | None = None,
+    ) -> str:
+        """Returns the query plan of a query, Without keeping any of its changes."""
+        raise NotImplementedError
+
+    def cursor(
+        self,
+        sql: str,
+        /,
+        *args: typing.Any,
+        prefetch: int | None = None,
+        timeout: float | None = None,
+    ) -> collections.AsyncGenerator[collections.Mapping[str, typing.Any], None]:
+        """Stream the query's rows from a server side cursor in a read-only transaction.
+
+        Closing the generator early releases the cursor's connection.
+        """
+        raise NotImplementedError
+
 
 @typing.runtime_checkable
 class PoolRunner(fast.FastProtocolChecking, typing.Protocol):
@@ -146,6 +192,12 @@ class PoolRunner(fast.FastProtocolChecking, typing.Protocol):
     async def fetch_destiny_members(self) -> iterators.LazyIterator[models.Membership]:
         raise NotImplementedError
 
+    def stream_destiny_members(
+        self, *, prefetch: int = 100
+    ) -> iterators.LazyIterator[models.Membership]:
+        """Stream all the members, Fetching only `prefetch` rows at a time."""
+        raise NotImplementedError
+
     async def put_destiny_member(
         self,
         user_id: snowflakes.Snowflake,
@@ -182,6 +234,25 @@ class NetRunner(fast.FastProtocolChecking, typing.Protocol):
     async def close(self) -> None:
         """Closes the HTTP client session."""
 
+    def circuits(self) -> collections.Mapping[str, net.CircuitBreaker]:
+        """Returns a snapshot of the per-host circuit breakers."""
+        raise NotImplementedError
+
+    def request_many(
+        self,
+        requests: collections.Iterable[net.Request],
+        /,
+        *,
+        concurrency: int = 8,
+        ordered: bool = False,
+    ) -> collections.AsyncIterator[net.Result]:
+        """Perform many HTTP requests concurrently, Yielding their results."""
+        raise NotImplementedError
+
+    def metrics(self) -> collections.Mapping[tuple[str, str], net.RouteMetrics]:
+        """Returns a snapshot of the recorded metrics keyed by host and route template."""
+        raise NotImplementedError
+
     @typing.overload
     async def request(
         self,
@@ -204,6 +275,18 @@ class NetRunner(fast.FastProtocolChecking, typing.Protocol):
     ) -> bytes | None:
         ...
 
+    @typing.overload
+    async def request(
+        self,
+        method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
+        url: str,
+        getter: None = None,
+        json: data_binding.JSONObjectBuilder | None = None,
+        *,
+        schema: type[_T],
+    ) -> _T:
+        ...
+
     async def request(
         self,
         method: typing.Literal["GET", "POST", "PUT", "DELETE", "PATCH"],
@@ -211,5 +294,10 @@ class NetRunner(fast.FastProtocolChecking, typing.Protocol):
         getter: str | None = None,
         json: data_binding.JSONObjectBuilder | None = None,
         unwrap_bytes: bool = False,
-    ) -> data_binding.JSONArray | data_binding.JSONObject | bytes | None:
-        """Perform an HTTP request."""
+        schema: type[typing.Any] | None = None,
+    ) -> typing.Any:
+        """Perform an HTTP request.
+
+        If a schema is passed, The JSON body is decoded and validated straight
+        into an instance of it.
+        """
@@ -0,0 +1,60 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""A local HTTP server for the tests that make real requests."""
+
+from __future__ import annotations
+
+import contextlib
+import socket
+import typing
+
+from aiohttp import web
+
+if typing.TYPE_CHECKING:
+    import collections.abc as collections
+
+
+async def _pong(_: web.Request) -> web.Response:
+    return web.json_response({"pong": True})
+
+
+PING: typing.Final[web.RouteDef] = web.get("/ping", _pong)
+"""Answers right away, For timing requests that must not be held up."""
+
+
+@contextlib.asynccontextmanager
+async def serve(*routes: web.RouteDef) -> collections.AsyncGenerator[str, None]:
+    """Serve these routes on a free local port, Yielding the server's base url."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.SockSite(runner, sock).start()
+    try:
+        yield f"http://127.0.0.1:{sock.getsockname()[1]}"
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,64 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+from core.std import cache
+
+
+def test_expiring_evicts_the_least_recently_used() -> None:
+    members = cache.Expiring[int, str](max_size=2)
+    members.put(1, "a")
+    members.put(2, "b")
+    assert members.get(1) == "a"
+
+    members.put(3, "c")
+    assert len(members) == 2
+    assert members.get(2) is None
+    assert members.get(1) == "a"
+    assert members.get(3) == "c"
+
+
+def test_expiring_entries_expire() -> None:
+    members = cache.Expiring[int, str | None](ttl=0.0)
+    members.put(1, "a")
+    members.put(2, None, ttl=60.0)
+
+    assert members.get(1, "missing") == "missing"
+    assert len(members) == 1
+    # A cached `None` is told apart from a missing entry by the default.
+    assert members.get(2, "missing") is None
+
+
+def test_expiring_pop_and_clear() -> None:
+    members = cache.Expiring[int, str]()
+    members.put(1, "a")
+    members.put(2, "b")
+
+    members.pop(1)
+    members.pop(1)
+    assert members.get(1) is None
+
+    members.clear()
+    assert not len(members)
@@ -0,0 +1,119 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pathlib
+import time
+from unittest import mock
+
+from aiohttp import web
+
+from core.std import manifest, net
+
+from . import mock_server
+
+_TABLE = "DestinyInventoryItemDefinition"
+_ENTITIES = 2_000
+_CHUNKS = 20
+_CHUNK_DELAY = 0.05
+
+
+def _definitions_route() -> web.RouteDef:
+    table = json.dumps(
+        {
+            str(hash_): {"hash": hash_, "displayProperties": {"name": f"Item {hash_}"}}
+            for hash_ in range(1, _ENTITIES + 1)
+        }
+    ).encode()
+
+    async def definitions(request: web.Request) -> web.StreamResponse:
+        # A slow download of a large table.
+        response = web.StreamResponse()
+        await response.prepare(request)
+        size = -(-len(table) // _CHUNKS)
+        for start in range(0, len(table), size):
+            await response.write(table[start : start + size])
+            await asyncio.sleep(_CHUNK_DELAY)
+        await response.write_eof()
+        return response
+
+    return web.get("/definitions.json", definitions)
+
+
+async def _update_while_requesting(
+    path: pathlib.Path,
+) -> tuple[float, float, manifest.Manifest]:
+    client = mock.Mock()
+    client.rest.fetch_manifest_path = mock.AsyncMock(
+        return_value={
+            "version": "1",
+            "jsonWorldComponentContentPaths": {"en": {_TABLE: "/definitions.json"}},
+        }
+    )
+    manifest_ = manifest.Manifest(client, path=path / "manifest.db", tables=(_TABLE,))
+    async with mock_server.serve(_definitions_route(), mock_server.PING) as base:
+        with mock.patch.object(manifest.aiobungie.url, "BASE", base):
+            async with net.HTTPNet() as http:
+                # Opens the shared session's connection before timing the request.
+                await http.request("GET", base + "/ping")
+
+                started = time.perf_counter()
+                update = asyncio.create_task(manifest_.update())
+                await asyncio.sleep(_CHUNK_DELAY * 2)
+                assert not update.done()
+
+                requested = time.perf_counter()
+                assert await http.request("GET", base + "/ping") == {"pong": True}
+                request_took = time.perf_counter() - requested
+                assert not update.done()
+
+                assert await update
+                update_took = time.perf_counter() - started
+
+    return request_took, update_took, manifest_
+
+
+def test_update_does_not_delay_other_requests(tmp_path: pathlib.Path) -> None:
+    async def run() -> tuple[float, float]:
+        request_took, update_took, manifest_ = await _update_while_requesting(tmp_path)
+        try:
+            assert manifest_.version == "1"
+            assert manifest_.get(_TABLE, 7) == {
+                "hash": 7,
+                "displayProperties": {"name": "Item 7"},
+            }
+            assert manifest_.search(_TABLE, "Item 12")[0].hash == 12
+        finally:
+            await manifest_.close()
+
+        return request_took, update_took
+
+    request_took, update_took = asyncio.run(run())
+    assert update_took >= _CHUNKS * _CHUNK_DELAY
+    # Answered while the table was still being downloaded.
+    assert request_took < _CHUNK_DELAY * 4
+    assert not (tmp_path / "manifest.db.download").exists()
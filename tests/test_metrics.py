@@ -0,0 +1,54 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import pytest
+
+from core.std import metrics
+
+
+def test_empty_histogram() -> None:
+    histogram = metrics.Histogram()
+    assert histogram.p50 == histogram.p99 == histogram.mean == 0.0
+
+
+def test_histogram_percentiles() -> None:
+    histogram = metrics.Histogram()
+    for value in range(1, 101):
+        histogram.observe(float(value))
+
+    assert histogram.count == 100
+    assert histogram.mean == pytest.approx(50.5)
+    assert histogram.max == 100.0
+    # Interpolated within the (25, 50] and (50, 100] buckets.
+    assert 25.0 < histogram.p50 <= 50.0
+    assert 50.0 < histogram.p95 <= 100.0
+    assert histogram.percentile(1.0) == 100.0
+
+
+def test_histogram_caps_the_last_bucket_at_the_max() -> None:
+    histogram = metrics.Histogram()
+    histogram.observe(45_000.0)
+    assert histogram.p99 == 45_000.0
@@ -0,0 +1,106 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import pathlib
+import typing
+from unittest import mock
+
+import hikari
+
+from core.psql import lite
+from core.std import config
+
+# The package exports the component under the module's name.
+mod = importlib.import_module("core.components.mod")
+
+
+def _run_sql(path: pathlib.Path, query: str, *, limit: int = 500) -> mock.AsyncMock:
+    async def run() -> mock.AsyncMock:
+        pool = lite.SqlitePool(
+            config.Config(DB_BACKEND="sqlite", SQLITE_PATH=str(path / "fated.db"))
+        )
+        await pool.open()
+        try:
+            for ctx_id in range(1, 4):
+                await pool.partial.execute(
+                    "INSERT INTO Destiny VALUES ($1, $2, $3, $4, $5);",
+                    ctx_id,
+                    ctx_id * 10,
+                    f"Guardian{ctx_id}",
+                    1000 + ctx_id,
+                    "Steam",
+                )
+
+            ctx = mock.Mock(author=hikari.Snowflake(1))
+            ctx.respond = mock.AsyncMock()
+            await mod.run_sql.callback(
+                ctx,
+                query,
+                explain=False,
+                limit=limit,
+                pool=pool,
+                component_client=mock.Mock(),
+            )
+        finally:
+            await pool.close()
+
+        return ctx.respond
+
+    return asyncio.run(run())
+
+
+def _description(respond: mock.AsyncMock) -> tuple[str, str]:
+    embed: hikari.Embed = respond.call_args.kwargs["embeds"][0]
+    assert embed.description is not None and embed.footer is not None
+    return embed.description, typing.cast(str, embed.footer.text)
+
+
+def test_sql_streams_sqlite_rows(tmp_path: pathlib.Path) -> None:
+    respond = _run_sql(tmp_path, "SELECT ctx_id, name FROM Destiny ORDER BY ctx_id")
+
+    description, footer = _description(respond)
+    assert "ctx_id | name" in description
+    assert "1      | Guardian1" in description
+    assert "3      | Guardian3" in description
+    assert footer.endswith("3 rows")
+
+
+def test_sql_caps_sqlite_rows(tmp_path: pathlib.Path) -> None:
+    respond = _run_sql(tmp_path, "SELECT name FROM Destiny ORDER BY ctx_id", limit=2)
+
+    description, footer = _description(respond)
+    assert "Guardian2" in description
+    assert "Guardian3" not in description
+    assert footer.endswith("2 rows, Capped at 2")
+
+
+def test_sql_fetches_sqlite_writes(tmp_path: pathlib.Path) -> None:
+    respond = _run_sql(tmp_path, "DELETE FROM Destiny WHERE ctx_id = 2 RETURNING name")
+
+    description, footer = _description(respond)
+    assert "Guardian2" in description
+    assert footer.endswith("1 rows")
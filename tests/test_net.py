@@ -0,0 +1,130 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from core.std import net
+
+from . import mock_server
+
+_RESPONSE_DELAY = 0.1
+
+
+def test_concurrent_gets_share_one_request() -> None:
+    hits = 0
+
+    async def profile(_: web.Request) -> web.Response:
+        nonlocal hits
+        hits += 1
+        await asyncio.sleep(_RESPONSE_DELAY)
+        return web.json_response({"name": "Guardian", "code": 1234})
+
+    async def run() -> list[object]:
+        async with mock_server.serve(
+            web.get("/profile", profile)
+        ) as base, net.HTTPNet() as http:
+            url = base + "/profile"
+            results = await asyncio.gather(
+                http.request("GET", url),
+                http.request("GET", url),
+                http.request("GET", url, "name"),
+                http.request("GET", url, "code"),
+            )
+            assert hits == 1
+
+            # Only requests that are in flight are shared, Not their responses.
+            await http.request("GET", url)
+            assert hits == 2
+
+        return list(results)
+
+    body = {"name": "Guardian", "code": 1234}
+    assert asyncio.run(run()) == [body, body, "Guardian", 1234]
+
+
+def test_route_metrics_group_ids_under_one_template() -> None:
+    async def user(request: web.Request) -> web.Response:
+        return web.json_response({"id": request.match_info["id"]})
+
+    async def run() -> dict[tuple[str, str], net.RouteMetrics]:
+        async with mock_server.serve(
+            web.get("/users/{id}", user)
+        ) as base, net.HTTPNet() as http:
+            for id_ in ("1", "4611686018467284386", "0123456789abcdef0123"):
+                assert await http.request("GET", f"{base}/users/{id_}", "id") == id_
+            return dict(http.metrics())
+
+    metrics = asyncio.run(run())
+    assert [route for _, route in metrics] == ["/users/{id}"]
+    stats = next(iter(metrics.values()))
+    assert stats.latency.count == 3
+    assert stats.statuses == {200: 3}
+    assert not stats.errors
+
+
+def test_circuit_opens_after_failures() -> None:
+    circuit = net.CircuitBreaker("bungie.net", threshold=0.5, min_calls=4)
+    circuit.record_success()
+    circuit.record_failure()
+    circuit.record_success()
+    assert circuit.state is net.CircuitState.CLOSED
+
+    circuit.record_failure()
+    assert circuit.state is net.CircuitState.OPEN
+    assert circuit.trips == 1
+    with pytest.raises(net.CircuitOpenError):
+        circuit.acquire()
+
+
+def test_circuit_lets_one_probe_through() -> None:
+    circuit = net.CircuitBreaker("bungie.net", min_calls=1, cooldown=0.05)
+    circuit.record_failure()
+    time.sleep(0.05)
+    assert circuit.state is net.CircuitState.HALF_OPEN
+
+    circuit.acquire()
+    # Other calls fail fast while the probe is in flight.
+    with pytest.raises(net.CircuitOpenError):
+        circuit.acquire()
+
+    circuit.record_success()
+    assert circuit.state is net.CircuitState.CLOSED
+    circuit.acquire()
+
+
+def test_failed_probe_reopens_the_circuit() -> None:
+    circuit = net.CircuitBreaker("bungie.net", min_calls=1, cooldown=0.05)
+    circuit.record_failure()
+    time.sleep(0.05)
+
+    circuit.acquire()
+    circuit.record_failure()
+    assert circuit.state is net.CircuitState.OPEN
+    assert circuit.trips == 2
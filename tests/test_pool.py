@@ -0,0 +1,141 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import asyncio
+import typing
+
+from core.psql import pool
+from core.std import traits
+
+
+class _Destiny:
+    """Runs the batched membership statements against a set of ctx_ids."""
+
+    def __init__(self) -> None:
+        self.members: set[int] = set()
+        self.statements: list[tuple[pool.Query, list[int]]] = []
+
+    async def fetch(self, sql: str, /, *args: typing.Any) -> list[tuple[int]]:
+        assert sql is pool.Query.PUT_MEMBERS
+        ctx_ids: list[int] = args[0]
+        self.statements.append((sql, ctx_ids))
+        # ON CONFLICT DO NOTHING RETURNING ctx_id
+        inserted: list[tuple[int]] = []
+        for ctx_id in ctx_ids:
+            if ctx_id not in self.members:
+                self.members.add(ctx_id)
+                inserted.append((ctx_id,))
+        return inserted
+
+    async def execute(self, sql: str, /, *args: typing.Any) -> None:
+        assert sql is pool.Query.REMOVE_MEMBERS
+        ctx_ids: list[int] = args[0]
+        self.statements.append((sql, ctx_ids))
+        self.members.difference_update(ctx_ids)
+
+
+def _record(ctx_id: int) -> tuple[int, int, str, int, str]:
+    return (ctx_id, ctx_id * 10, f"Guardian{ctx_id}", 1000 + ctx_id, "Steam")
+
+
+def _writer(destiny: _Destiny, **kwargs: typing.Any) -> pool.WriteBehind:
+    return pool.WriteBehind(typing.cast(traits.PartialPool, destiny), **kwargs)
+
+
+def test_batch_keeps_the_writes_order() -> None:
+    destiny = _Destiny()
+
+    async def run() -> None:
+        writer = _writer(destiny, max_size=4, delay=60.0)
+        # Filling the batch flushes it right away.
+        await asyncio.gather(
+            writer.insert(_record(1)),
+            writer.insert(_record(2)),
+            writer.delete(1),
+            writer.insert(_record(1)),
+        )
+
+    asyncio.run(run())
+    assert destiny.statements == [
+        (pool.Query.PUT_MEMBERS, [1, 2]),
+        (pool.Query.REMOVE_MEMBERS, [1]),
+        (pool.Query.PUT_MEMBERS, [1]),
+    ]
+    assert destiny.members == {1, 2}
+
+
+def test_batches_flush_in_order() -> None:
+    destiny = _Destiny()
+
+    async def run() -> None:
+        writer = _writer(destiny, max_size=2, delay=60.0)
+        await asyncio.gather(
+            writer.insert(_record(1)),
+            writer.insert(_record(2)),
+            writer.delete(2),
+            writer.delete(1),
+        )
+
+    asyncio.run(run())
+    assert destiny.statements == [
+        (pool.Query.PUT_MEMBERS, [1, 2]),
+        (pool.Query.REMOVE_MEMBERS, [2, 1]),
+    ]
+    assert not destiny.members
+
+
+def test_close_flushes_pending_writes() -> None:
+    destiny = _Destiny()
+
+    async def run() -> None:
+        writer = _writer(destiny, max_size=100, delay=60.0)
+        writes = [asyncio.create_task(writer.insert(_record(i))) for i in range(3)]
+        await asyncio.sleep(0)
+        assert not destiny.statements
+
+        await writer.close()
+        assert all(write.done() for write in writes)
+        await asyncio.gather(*writes)
+
+    asyncio.run(run())
+    assert destiny.members == {0, 1, 2}
+
+
+def test_duplicate_insert_in_a_batch_raises() -> None:
+    destiny = _Destiny()
+
+    async def run() -> None:
+        writer = _writer(destiny, max_size=2, delay=60.0)
+        first, second = await asyncio.gather(
+            writer.insert(_record(1)),
+            writer.insert(_record(1)),
+            return_exceptions=True,
+        )
+        assert first is None
+        assert isinstance(second, pool.ExistsError)
+
+    asyncio.run(run())
+    assert destiny.statements == [(pool.Query.PUT_MEMBERS, [1, 1])]
@@ -0,0 +1,74 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from core.std import net, prefetch
+
+from . import mock_server
+
+_REFILL_DELAY = 0.5
+
+
+def test_refill_does_not_delay_other_requests() -> None:
+    in_flight = 0
+
+    async def random_image(_: web.Request) -> web.Response:
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            await asyncio.sleep(_REFILL_DELAY)
+        finally:
+            in_flight -= 1
+        return web.json_response({"link": "https://example.com/image.png"})
+
+    async def run() -> tuple[float, int]:
+        async with mock_server.serve(
+            web.get("/random", random_image), mock_server.PING
+        ) as base, net.HTTPNet() as http:
+            prefetcher = prefetch.Prefetcher(http, size=2)
+            try:
+                # Registers the endpoint, The refill keeps requesting it after this.
+                assert await prefetcher.get(base + "/random", "link")
+                await asyncio.sleep(_REFILL_DELAY / 5)
+                assert in_flight
+
+                requested = time.perf_counter()
+                assert await http.request("GET", base + "/ping") == {"pong": True}
+                took = time.perf_counter() - requested
+                # Answered while the refill was still waiting on its response.
+                refilling = in_flight
+            finally:
+                await prefetcher.close()
+
+        return took, refilling
+
+    took, refilling = asyncio.run(run())
+    assert took < _REFILL_DELAY / 2
+    assert refilling
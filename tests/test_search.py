@@ -0,0 +1,74 @@
+# -*- config: utf-8 -*-
+# MIT License
+#
+# Copyright (c) 2021 - Present nxtlo
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+from core.std import search
+
+_INDEX = search.Index(
+    [
+        (1, "Gjallarhorn", ("Rocket Launcher",)),
+        (2, "Gjallarhorn", ("Ornament",)),
+        (3, "Ace of Spades", ("Hand Cannon",)),
+        (4, "Spare Rations", ("Hand Cannon",)),
+        (5, "The Last Word", ("Hand Cannon",)),
+        (6, "", ()),
+    ]
+)
+
+
+def test_empty_names_are_not_indexed() -> None:
+    assert len(_INDEX) == 5
+    assert _INDEX.search("  ") == []
+
+
+def test_prefix_matches_rank_names_before_words() -> None:
+    assert _INDEX.search("spa") == [
+        search.Match(4, "Spare Rations"),
+        search.Match(3, "Ace of Spades"),
+    ]
+
+
+def test_exact_name_ranks_first() -> None:
+    assert _INDEX.search("the last word")[0] == search.Match(5, "The Last Word")
+
+
+def test_suggested_words_match() -> None:
+    assert [match.hash for match in _INDEX.search("cannon")] == [3, 4, 5]
+    assert _INDEX.search("rocket") == [search.Match(1, "Gjallarhorn")]
+
+
+def test_names_are_not_repeated() -> None:
+    assert _INDEX.search("gjallarhorn") == [search.Match(1, "Gjallarhorn")]
+
+
+def test_fuzzy_matches_typos() -> None:
+    assert _INDEX.search("Gjalarhorn") == [search.Match(1, "Gjallarhorn")]
+    assert _INDEX.search("spare rashions", limit=1) == [
+        search.Match(4, "Spare Rations")
+    ]
+
+
+def test_limit() -> None:
+    assert len(_INDEX.search("hand", limit=2)) == 2